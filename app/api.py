@@ -1,10 +1,20 @@
 """Application entrypoint
 """
 
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.openapi.utils import get_openapi
 from app.config import get_settings
-from app.routers import auth, network, system, voice, skills
+from app.common.deadline import DeadlineMiddleware
+from app.common.devices import DeviceMiddleware, devices
+from app.common.lanes import LaneMiddleware
+from app.common.metrics import MetricsMiddleware, metrics
+from app.common.responses import ORJSONResponse
+from app.common.tracing import TracingMiddleware, tracer
+from app.routers import auth, batch, bus as bus_router, devices as devices_router
+from app.routers import fleet, metrics as metrics_router, network, system, voice
+from app.routers import skills
 
 settings = get_settings()
 
@@ -38,7 +48,34 @@ def custom_openapi_schema() -> dict:
     return app.openapi_schema
 
 
-app = FastAPI(title=settings.app_name, version=settings.app_version)
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    """Open the bus connection of every device and start the metrics and
+    traces exports when the application starts, close the connections and
+    export the remaining traces when the application stops.
+
+    If the bus of a device is not reachable at startup, the connection will
+    be opened by the first request sent to this device.
+    """
+    metrics.start()
+    tracer.start()
+    await asyncio.gather(
+        *(device.bus.connect() for device in devices.values()),
+        return_exceptions=True,
+    )
+    yield
+    await asyncio.gather(*(device.commands.close() for device in devices.values()))
+    await asyncio.gather(*(device.bus.close() for device in devices.values()))
+    await metrics.stop()
+    await tracer.stop()
+
+
+app = FastAPI(
+    title=settings.app_name,
+    version=settings.app_version,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 app.openapi = custom_openapi_schema
 
@@ -47,3 +84,14 @@ app.include_router(skills.router, prefix=settings.prefix_version)
 app.include_router(system.router, prefix=settings.prefix_version)
 app.include_router(voice.router, prefix=settings.prefix_version)
 app.include_router(network.router, prefix=settings.prefix_version)
+app.include_router(batch.router, prefix=settings.prefix_version)
+app.include_router(bus_router.router, prefix=settings.prefix_version)
+app.include_router(devices_router.router, prefix=settings.prefix_version)
+app.include_router(fleet.router, prefix=settings.prefix_version)
+app.include_router(metrics_router.router)
+
+app.add_middleware(LaneMiddleware)
+app.add_middleware(DeadlineMiddleware)
+app.add_middleware(DeviceMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
@@ -1,15 +1,87 @@
 """Super class of HTTPBearer from FastAPI to handle Bearer token
 """
 
+from collections import OrderedDict
+from hashlib import sha256
+from secrets import compare_digest
+from time import perf_counter, time
+from typing import Dict, Optional
 from jwt import ExpiredSignatureError, InvalidTokenError
 from fastapi import Request, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.auth.handlers import decode_jwt, get_user
+from app.auth.store import store
+from app.common.metrics import metrics
+from app.common.tracing import tracer
 from app.config import get_settings
 
 settings = get_settings()
 
 
+class TokenCache:
+    """Bounded LRU of verified access tokens.
+
+    Tokens are indexed by their SHA-256 digest and their decoded claims
+    are kept until the token expires. Entries of users no longer active
+    are evicted each time the user store is reloaded.
+    """
+
+    def __init__(self, size: int):
+        self.size: int = size
+        self.hits: int = 0
+        self.misses: int = 0
+        self._tokens: OrderedDict = OrderedDict()
+
+    def get(self, jwt_token: str) -> Optional[Dict]:
+        """Retrieve the claims of a verified token
+
+        :param jwt_token: JWT token to look for
+        :type jwt_token: str
+        :return: Return the claims if the token has been verified
+        :rtype: dict, optional
+        """
+        # Reload the user store if the JSON database changed, this evicts
+        # the tokens of deactivated users.
+        store.refresh()
+        digest: bytes = sha256(jwt_token.encode("utf-8")).digest()
+        claims: Optional[Dict] = self._tokens.get(digest)
+        if claims is None or claims["exp"] <= time():
+            self._tokens.pop(digest, None)
+            self.misses += 1
+            return None
+        self._tokens.move_to_end(digest)
+        self.hits += 1
+        return claims
+
+    def put(self, jwt_token: str, claims: Dict) -> None:
+        """Store the claims of a verified token
+
+        :param jwt_token: JWT token verified
+        :type jwt_token: str
+        :param claims: Decoded claims of the token
+        :type claims: dict
+        """
+        if self.size <= 0:
+            return
+        self._tokens[sha256(jwt_token.encode("utf-8")).digest()] = claims
+        while len(self._tokens) > self.size:
+            self._tokens.popitem(last=False)
+
+    def prune(self) -> None:
+        """Evict the tokens of users no longer existing or active"""
+        for digest, claims in list(self._tokens.items()):
+            if not get_user(claims["sub"]):
+                self._tokens.pop(digest, None)
+
+    def stats(self) -> Dict:
+        """Cache counters
+
+        :return: Return the cache size and counters
+        :rtype: dict
+        """
+        return {"size": len(self._tokens), "hits": self.hits, "misses": self.misses}
+
+
 class JWTBearer(HTTPBearer):
     """Override HTTPBearer class"""
 
@@ -40,29 +112,41 @@ class JWTBearer(HTTPBearer):
 
         The JWT token is decoded and checked for a `user` key, if this key is
         found then it campares the value with the `default_admin` option
-        from `config.py`.
+        from `config.py`. Verified tokens are cached until they expire.
 
         :param jwt_token: JWT token to verify
         :type jwt_token: str
         :return: Return True or False
         :rtype: bool
         """
-        try:
-            payload: dict = decode_jwt(jwt_token)
-            if get_user(payload["sub"]) and payload["scope"] == "access":
+        with tracer.span("jwt.verify") as span:
+            started: float = perf_counter()
+            if token_cache.get(jwt_token):
+                metrics.observe("jwt", perf_counter() - started, "hit")
+                span.set("jwt.cache", "hit")
                 return True
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="invalid scope for token",
-            )
-        except ExpiredSignatureError:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="access token expired"
-            )
-        except InvalidTokenError:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid access token"
-            )
+            try:
+                payload: dict = decode_jwt(jwt_token)
+                if get_user(payload["sub"]) and payload["scope"] == "access":
+                    token_cache.put(jwt_token, payload)
+                    return True
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="invalid scope for token",
+                )
+            except ExpiredSignatureError:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="access token expired",
+                )
+            except InvalidTokenError:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="invalid access token",
+                )
+            finally:
+                metrics.observe("jwt", perf_counter() - started, "miss")
+                span.set("jwt.cache", "miss")
 
     @classmethod
     def verify_refresh_jwt(cls, jwt_token: str) -> bool:
@@ -93,3 +177,27 @@ class JWTBearer(HTTPBearer):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid refresh token"
             )
+
+
+class MetricsBearer(JWTBearer):
+    """Accept the static `METRICS_TOKEN` of the Prometheus scrapers on top
+    of the access tokens, the access tokens expire too soon to be set in
+    a scrape configuration.
+    """
+
+    async def __call__(self, request: Request):
+        authorization: str = request.headers.get("authorization", "")
+        scheme, _, credentials = authorization.partition(" ")
+        if (
+            settings.metrics_token
+            and scheme == "Bearer"
+            and compare_digest(
+                credentials.encode("utf-8"), settings.metrics_token.encode("utf-8")
+            )
+        ):
+            return
+        await super(MetricsBearer, self).__call__(request)
+
+
+token_cache: TokenCache = TokenCache(settings.jwt_cache_size)
+store.listeners.append(token_cache.prune)
@@ -2,12 +2,12 @@
 """
 
 import bcrypt
-import json
 from app.config import get_settings
+from app.auth.store import store
 from app.common.constants import JWT_SCOPES, JWT_ISSUER
+from app.common.tracing import tracer
 from datetime import datetime, timedelta
 from jwt import encode, decode, DecodeError, InvalidSignatureError
-from pathlib import Path
 
 
 settings = get_settings()
@@ -108,16 +108,12 @@ def refresh_jwt(token: str) -> str:
 def get_users() -> list:
     """Retrieve user list from a JSON database
 
+    The JSON database is loaded in memory and reloaded when it changes.
+
     :return: Return list of user and their information
     :rtype: list
     """
-    if Path(settings.users_db).is_file():
-        try:
-            with open(settings.users_db, encoding="utf-8") as data:
-                return json.load(data)
-        except IOError as err:
-            return err
-    return False
+    return store.users
 
 
 def get_user(user: str) -> dict:
@@ -128,9 +124,10 @@ def get_user(user: str) -> dict:
     :return: Return user information
     :rtype: dict
     """
-    for data in get_users():
-        if data["user"] == user and data["active"]:
-            return data
+    with tracer.span("user.lookup"):
+        data: dict = store.get(user)
+    if data and data["active"]:
+        return data
     return False
 
 
@@ -0,0 +1,112 @@
+"""Bounded worker pool for the password verifications
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Dict, Tuple
+from fastapi import HTTPException, status
+from app.auth.handlers import verify_password
+from app.common.metrics import metrics
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class PasswordPool:
+    """Run the bcrypt verifications within dedicated threads.
+
+    bcrypt releases the GIL while hashing, the event loop keeps serving
+    the other requests during a login. When `workers` verifications are
+    running and `queue_size` are waiting, new logins are rejected with a
+    HTTP 429 instead of delaying the other requests.
+    """
+
+    def __init__(self, workers: int, queue_size: int):
+        self.workers: int = workers
+        self.queue_size: int = queue_size
+        self.pending: int = 0
+        self.verified: int = 0
+        self.rejected: int = 0
+        self.wait_time: float = 0.0
+        self.wait_time_max: float = 0.0
+        self.hash_time: float = 0.0
+        self.hash_time_max: float = 0.0
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password"
+        )
+
+    async def verify(self, clear_password: str, hash_password: str) -> bool:
+        """Compare clear and hash passwords within the pool
+
+        :param clear_password: Password provided by the user
+        :type clear_password: str
+        :param hash_password: Hashed password from the JSON database
+        :type hash_password: str
+        :return: Return verify status as boolean
+        :rtype: bool
+        """
+        if self.pending >= self.workers + self.queue_size:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="too many login attempts in progress",
+                headers={"Retry-After": "1"},
+            )
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        self.pending += 1
+        submitted: float = perf_counter()
+        try:
+            verified, started, finished = await loop.run_in_executor(
+                self._executor, self._verify, clear_password, hash_password
+            )
+        finally:
+            self.pending -= 1
+        self.verified += 1
+        self.wait_time += started - submitted
+        self.wait_time_max = max(self.wait_time_max, started - submitted)
+        self.hash_time += finished - started
+        self.hash_time_max = max(self.hash_time_max, finished - started)
+        metrics.observe("password_wait", started - submitted)
+        metrics.observe("password_hash", finished - started)
+        return verified
+
+    def stats(self) -> Dict:
+        """Pool counters, durations are in seconds
+
+        :return: Return the pool status and counters
+        :rtype: dict
+        """
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "pending": self.pending,
+            "verified": self.verified,
+            "rejected": self.rejected,
+            "wait_time": self.wait_time,
+            "wait_time_max": self.wait_time_max,
+            "hash_time": self.hash_time,
+            "hash_time_max": self.hash_time_max,
+        }
+
+    @staticmethod
+    def _verify(clear_password: str, hash_password: str) -> Tuple[bool, float, float]:
+        """Verify the password and time the verification
+
+        :param clear_password: Password provided by the user
+        :type clear_password: str
+        :param hash_password: Hashed password from the JSON database
+        :type hash_password: str
+        :return: Return verify status, start and end times
+        :rtype: tuple
+        """
+        started: float = perf_counter()
+        verified: bool = verify_password(clear_password, hash_password)
+        return verified, started, perf_counter()
+
+
+password_pool: PasswordPool = PasswordPool(
+    workers=settings.auth_workers, queue_size=settings.auth_queue_size
+)
+
+metrics.gauge("password_in_flight", lambda: password_pool.pending)
@@ -0,0 +1,92 @@
+"""In-memory user store loaded from the JSON database
+"""
+
+import json
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class UserStore:
+    """Users from the JSON database indexed by their name.
+
+    The file is parsed once and parsed again only when its inode, size or
+    modification time changes, for example when a Docker volume is updated.
+    The new index replaces the previous one at once, a file that cannot be
+    parsed keeps the previous users. The functions from `listeners` are
+    called after each reload.
+    """
+
+    def __init__(self, path: str):
+        self.path: str = path
+        self.reloads: int = 0
+        self.listeners: List[Callable] = []
+        self._users: List[Dict] = []
+        self._index: Dict[str, Dict] = {}
+        self._signature: Optional[Tuple[int, int, int, int]] = None
+
+    @property
+    def users(self) -> List[Dict]:
+        """Users as declared in the JSON database
+
+        :return: Return list of user and their information
+        :rtype: list
+        """
+        self.refresh()
+        return self._users
+
+    def get(self, user: str) -> Optional[Dict]:
+        """Retrieve a user by its name
+
+        :param user: User name to look for
+        :type user: str
+        :return: Return user information if found
+        :rtype: dict, optional
+        """
+        self.refresh()
+        return self._index.get(user)
+
+    def refresh(self) -> None:
+        """Reload the JSON database if the file changed"""
+        try:
+            stat: os.stat_result = os.stat(self.path)
+        except OSError:
+            self._swap(None, [])
+            return
+        signature: Tuple[int, int, int, int] = (
+            stat.st_dev,
+            stat.st_ino,
+            stat.st_size,
+            stat.st_mtime_ns,
+        )
+        if signature == self._signature:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as data:
+                self._swap(signature, json.load(data))
+        except (IOError, ValueError, KeyError, TypeError):
+            return
+
+    def _swap(
+        self, signature: Optional[Tuple[int, int, int, int]], users: List[Dict]
+    ) -> None:
+        """Replace the users and their index
+
+        :param signature: File signature the users have been loaded from
+        :type signature: tuple, optional
+        :param users: Users loaded from the JSON database
+        :type users: list
+        """
+        if signature is None and self._signature is None:
+            return
+        self._index = {data["user"]: data for data in users}
+        self._users = users
+        self._signature = signature
+        self.reloads += 1
+        for listener in self.listeners:
+            listener()
+
+
+store: UserStore = UserStore(settings.users_db)
@@ -0,0 +1,464 @@
+"""Long-lived connection to an OVOS message bus shared by every handler
+"""
+
+import asyncio
+import logging
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
+import orjson
+from websockets.asyncio.client import ClientConnection, connect
+from websockets.exceptions import WebSocketException
+from app.config import get_settings
+from app.common import constants
+from app.common.deadline import expiry, unbounded
+from app.common.metrics import metrics
+from app.common.tracing import SPAN_KIND_CLIENT, request_id, tracer
+from app.common.typing import JSONStructure
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class AmbiguousAnswer(Exception):
+    """Answer without context ID that several waiters could claim"""
+
+
+class Waiter:
+    """Pending answer expected from the bus"""
+
+    def __init__(self, message_type: str, ident: str, key: Any = None):
+        self.message_type: str = message_type
+        self.ident: str = ident
+        self.key: Any = key
+        self.websocket: Optional[ClientConnection] = None
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    def match(self, message: JSONStructure) -> bool:
+        """Check if the message is the answer expected by this waiter
+
+        The message is accepted if it carries data or if the skill refused
+        the authentication. When the answer carries back the context ID of
+        the request, it must be the ID of this waiter. Otherwise the data
+        field listed in `BUS_ANSWER_KEYS` for this message type, when
+        present, must be the one of the request.
+
+        :param message: Decoded message received from the bus
+        :type message: JSONStructure
+        :return: Return True if the message is the expected answer
+        :rtype: bool
+        """
+        context: Dict = message.get("context") or {}
+        if context.get(constants.BUS_CONTEXT_ID, self.ident) != self.ident:
+            return False
+        field: Optional[str] = constants.BUS_ANSWER_KEYS.get(self.message_type)
+        data: Dict = message.get("data") or {}
+        if constants.BUS_CONTEXT_ID not in context and field in data:
+            if data[field] != self.key:
+                return False
+        return bool(data) or not context.get("authenticated", True)
+
+    def claims(self, message: JSONStructure) -> bool:
+        """Check if the message can only be the answer of this waiter
+
+        :param message: Message accepted by `match()`
+        :type message: JSONStructure
+        :return: Return True if the message carries back the context ID or
+                 the identifying data field of the request
+        :rtype: bool
+        """
+        context: Dict = message.get("context") or {}
+        field: Optional[str] = constants.BUS_ANSWER_KEYS.get(self.message_type)
+        return constants.BUS_CONTEXT_ID in context or field in (
+            message.get("data") or {}
+        )
+
+
+class BusClient:
+    """Keep a single websocket connection to the bus open and re-open it
+    transparently when it drops.
+
+    A background task reads every message once and hands it over to the
+    callers waiting for this message type, this allows concurrent requests
+    to share the same connection without blocking the event loop.
+
+    Identical read-only requests sent concurrently share a single round
+    trip, the `leaders` counter exposes the round trips performed for them
+    and the `coalesced` counter the requests served by another one.
+
+    The `connects` and `reconnects` counters expose how many handshakes
+    have been performed since the application started.
+    """
+
+    def __init__(self, uri: str, timeout: int):
+        self.uri: str = uri
+        self.timeout: int = timeout
+        self.connects: int = 0
+        self.reconnects: int = 0
+        self.failures: int = 0
+        self.sent: int = 0
+        self.received: int = 0
+        self.matched: int = 0
+        self.ignored: int = 0
+        self.timeouts: int = 0
+        self.ambiguous: int = 0
+        self.leaders: int = 0
+        self.coalesced: int = 0
+        self._websocket: Optional[ClientConnection] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._waiters: Dict[str, List[Waiter]] = {}
+        self._handlers: Dict[str, List[Callable]] = {}
+        self._flights: Dict[Tuple[str, str, bytes], asyncio.Task] = {}
+        self._reader: Optional[asyncio.Task] = None
+
+    @property
+    def connected(self) -> bool:
+        """Connection status
+
+        :return: Return True if the websocket is open
+        :rtype: bool
+        """
+        return self._websocket is not None and self._websocket.close_code is None
+
+    @property
+    def pending(self) -> int:
+        """Requests waiting for their answer
+
+        :return: Return the number of waiting requests
+        :rtype: int
+        """
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    async def connect(self) -> ClientConnection:
+        """Open the websocket connection if not already opened and start
+        the reader task.
+
+        :return: Return the opened websocket
+        :rtype: ClientConnection
+        """
+        if self._reader is None:
+            self._lock = asyncio.Lock()
+            self._reader = asyncio.create_task(self._read(), name="bus-reader")
+        async with self._lock:
+            if self.connected:
+                return self._websocket
+            try:
+                self._websocket = await connect(
+                    self.uri, open_timeout=self.timeout, max_size=None
+                )
+            except (WebSocketException, OSError):
+                self.failures += 1
+                raise
+            if self.connects:
+                self.reconnects += 1
+            self.connects += 1
+            return self._websocket
+
+    async def close(self) -> None:
+        """Close the websocket connection and stop the reader task"""
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+            self._reader = None
+        if self._websocket is not None:
+            await self._websocket.close()
+            self._websocket = None
+
+    async def send(self, payload: JSONStructure) -> ClientConnection:
+        """Send a message to the bus, reconnect once if the connection
+        has been dropped.
+
+        The ID of the HTTP request being served is added to the message
+        context to link the skill logs to the request.
+
+        :param payload: JSON dict to send to the bus
+        :type payload: JSONStructure
+        :return: Return the websocket the message has been sent over
+        :rtype: ClientConnection
+        """
+        if request_id():
+            payload = dict(payload)
+            payload["context"] = dict(payload.get("context") or {})
+            payload["context"][constants.BUS_REQUEST_ID] = request_id()
+        # The bus expects text frames
+        message: str = orjson.dumps(payload).decode()
+        with tracer.span("bus.send", SPAN_KIND_CLIENT) as span:
+            span.set("bus.message", str(payload.get("type")))
+            async with asyncio.timeout_at(expiry()):
+                for attempt in range(2):
+                    websocket: ClientConnection = await self.connect()
+                    try:
+                        await websocket.send(message)
+                        self.sent += 1
+                        return websocket
+                    except (WebSocketException, OSError):
+                        self._drop(websocket)
+                        if attempt:
+                            raise
+
+    async def request(
+        self, payload: JSONStructure, wait_for_message: str, timeout: float
+    ) -> JSONStructure:
+        """Send a message to the bus and wait for its answer
+
+        The read-only messages identical to a message already waiting for
+        its answer are not sent again, the callers share the round trip in
+        flight and its answer, each one within its own deadline.
+
+        :param payload: JSON dict to send to the bus
+        :type payload: JSONStructure
+        :param wait_for_message: Message to wait for from the bus
+        :type wait_for_message: str
+        :param timeout: Seconds to wait for the answer
+        :type timeout: float
+        :return: Return the received message or an empty dict on timeout
+        :rtype: JSONStructure
+        """
+        if payload.get("type") not in constants.BUS_READ_ONLY_TYPES:
+            return await self._request(payload, wait_for_message, timeout)
+        key: Tuple[str, str, bytes] = (
+            payload["type"],
+            wait_for_message,
+            orjson.dumps(payload.get("data"), option=orjson.OPT_SORT_KEYS),
+        )
+        flight: Optional[asyncio.Task] = self._flights.get(key)
+        if flight is None:
+            self.leaders += 1
+            # The round trip outlives the caller starting it when the other
+            # callers have a longer budget or when its client disconnects.
+            with unbounded():
+                flight = asyncio.create_task(
+                    self._request(payload, wait_for_message, timeout)
+                )
+            self._flights[key] = flight
+            flight.add_done_callback(lambda _: self._land(key, flight))
+        else:
+            self.coalesced += 1
+        try:
+            async with asyncio.timeout_at(expiry()):
+                return await asyncio.shield(flight)
+        except TimeoutError:
+            self.timeouts += 1
+            return {}
+
+    async def _request(
+        self, payload: JSONStructure, wait_for_message: str, timeout: float
+    ) -> JSONStructure:
+        """Send a message to the bus and wait for its answer
+
+        A context ID is added to the message, skills replying to the message
+        carry it back which allows to route the answer to the right caller.
+
+        :param payload: JSON dict to send to the bus
+        :type payload: JSONStructure
+        :param wait_for_message: Message to wait for from the bus
+        :type wait_for_message: str
+        :param timeout: Seconds to wait for the answer
+        :type timeout: float
+        :return: Return the received message or an empty dict on timeout or
+                 when the answer can not be attributed
+        :rtype: JSONStructure
+        """
+        field: Optional[str] = constants.BUS_ANSWER_KEYS.get(wait_for_message)
+        waiter: Waiter = Waiter(
+            wait_for_message, uuid4().hex, (payload.get("data") or {}).get(field)
+        )
+        payload = dict(payload)
+        payload["context"] = dict(payload.get("context") or {})
+        payload["context"][constants.BUS_CONTEXT_ID] = waiter.ident
+        self._waiters.setdefault(wait_for_message, []).append(waiter)
+        started: float = perf_counter()
+        outcome: str = "error"
+        with tracer.span("bus.request", SPAN_KIND_CLIENT) as span:
+            span.set("bus.message", str(payload.get("type")))
+            span.set("bus.wait_for", wait_for_message)
+            try:
+                async with asyncio.timeout_at(expiry(timeout)):
+                    waiter.websocket = await self.send(payload)
+                    # The connection may have been lost while sending, its
+                    # waiters have already been failed by the reader.
+                    if waiter.websocket.close_code is not None:
+                        raise ConnectionError("bus connection lost")
+                    with tracer.span("bus.wait") as wait:
+                        wait.set("bus.message", wait_for_message)
+                        message: JSONStructure = await waiter.future
+                outcome = "answered"
+                return message
+            except TimeoutError:
+                self.timeouts += 1
+                outcome = "timeout"
+                return {}
+            except AmbiguousAnswer:
+                self.ambiguous += 1
+                outcome = "ambiguous"
+                return {}
+            finally:
+                self._discard(waiter)
+                span.set("bus.outcome", outcome)
+                metrics.observe(
+                    "bus", perf_counter() - started, wait_for_message, outcome
+                )
+
+    def on(self, message_type: str, handler: Callable) -> None:
+        """Call a function each time a message type is received, the
+        function is called from the reader task and must not block.
+        Functions registered for `*` receive every message.
+
+        :param message_type: Message type to listen for
+        :type message_type: str
+        :param handler: Function called with the decoded message
+        :type handler: Callable
+        """
+        self._handlers.setdefault(message_type, []).append(handler)
+
+    def remove(self, message_type: str, handler: Callable) -> None:
+        """Stop calling a function registered with `on()`
+
+        :param message_type: Message type listened for
+        :type message_type: str
+        :param handler: Function to remove
+        :type handler: Callable
+        """
+        handlers: List[Callable] = self._handlers.get(message_type, [])
+        if handler in handlers:
+            handlers.remove(handler)
+
+    def stats(self) -> Dict:
+        """Connection counters
+
+        :return: Return the connection status and counters
+        :rtype: dict
+        """
+        return {
+            "connected": self.connected,
+            "connects": self.connects,
+            "reconnects": self.reconnects,
+            "failures": self.failures,
+            "sent": self.sent,
+            "received": self.received,
+            "matched": self.matched,
+            "ignored": self.ignored,
+            "timeouts": self.timeouts,
+            "ambiguous": self.ambiguous,
+            "pending": self.pending,
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+        }
+
+    def _drop(self, websocket: ClientConnection) -> None:
+        """Forget a broken websocket, the next interaction will reconnect
+
+        :param websocket: Websocket to forget
+        :type websocket: ClientConnection
+        """
+        if websocket is self._websocket:
+            self._websocket = None
+
+    def _discard(self, waiter: Waiter) -> None:
+        """Stop waiting for an answer
+
+        :param waiter: Waiter to remove
+        :type waiter: Waiter
+        """
+        waiters: List[Waiter] = self._waiters.get(waiter.message_type, [])
+        if waiter in waiters:
+            waiters.remove(waiter)
+        if not waiters:
+            self._waiters.pop(waiter.message_type, None)
+
+    def _land(self, key: Tuple[str, str, bytes], flight: asyncio.Task) -> None:
+        """Forget a finished round trip, the next identical request is sent
+        to the bus again
+
+        :param key: Message type, answer type and data of the round trip
+        :type key: tuple
+        :param flight: Task of the round trip
+        :type flight: asyncio.Task
+        """
+        if self._flights.get(key) is flight:
+            self._flights.pop(key)
+        # Errors are raised to the callers waiting for the round trip, the
+        # ones having left have nobody to raise them to.
+        if not flight.cancelled():
+            flight.exception()
+
+    def _dispatch(self, message: JSONStructure) -> None:
+        """Hand a message over to the registered handlers and to the
+        callers waiting for it
+
+        :param message: Decoded message received from the bus
+        :type message: JSONStructure
+        """
+        handlers: List[Callable] = self._handlers.get(message.get("type"), [])
+        for handler in handlers + self._handlers.get(constants.BUS_ANY, []):
+            try:
+                handler(message)
+            except Exception:
+                logger.exception("bus handler failed for %s", message.get("type"))
+        waiters: List[Waiter] = [
+            waiter
+            for waiter in self._waiters.get(message.get("type"), [])
+            if waiter.match(message)
+        ]
+        if not waiters:
+            self.ignored += 1
+            return
+        self.matched += 1
+        # An answer without context ID nor identifying field could be the
+        # answer of any of the waiters, none of them gets it rather than
+        # all of them getting an answer which may not be theirs.
+        if len(waiters) > 1 and not waiters[0].claims(message):
+            self._fail(waiters, AmbiguousAnswer(message.get("type")))
+            return
+        for waiter in waiters:
+            if not waiter.future.done():
+                waiter.future.set_result(message)
+
+    def _fail(self, waiters: List[Waiter], error: Exception) -> None:
+        """Stop the waiters with an error instead of an answer
+
+        :param waiters: Waiters to stop
+        :type waiters: list
+        :param error: Error raised to the callers
+        :type error: Exception
+        """
+        for waiter in waiters:
+            if not waiter.future.done():
+                waiter.future.set_exception(error)
+
+    async def _read(self) -> None:
+        """Reader task, parse every message received from the bus and
+        dispatch it. The connection is re-opened when it drops.
+        """
+        while True:
+            try:
+                websocket: ClientConnection = await self.connect()
+            except (WebSocketException, OSError):
+                await asyncio.sleep(1)
+                continue
+            try:
+                async for raw in websocket:
+                    self.received += 1
+                    try:
+                        self._dispatch(orjson.loads(raw))
+                    except (ValueError, AttributeError):
+                        self.ignored += 1
+            except (WebSocketException, OSError):
+                pass
+            self._drop(websocket)
+            # The answers of the messages sent over the lost connection
+            # will never come, the callers do not wait for their timeout.
+            # The messages not sent yet or already sent again over a new
+            # connection keep waiting.
+            self._fail(
+                [
+                    waiter
+                    for waiters in self._waiters.values()
+                    for waiter in waiters
+                    if waiter.websocket is websocket
+                ],
+                ConnectionError("bus connection lost"),
+            )
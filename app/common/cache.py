@@ -0,0 +1,301 @@
+"""Caches avoiding bus round trips for information that rarely changes
+"""
+
+import asyncio
+from contextvars import Context
+from hashlib import sha256
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from fastapi import Request, status
+from fastapi.responses import Response
+from app.common.deadline import unbounded
+from app.common.responses import response_class
+
+
+class StatusCache:
+    """Keep a status retrieved from the bus during `ttl` seconds.
+
+    Once expired, the cached status is still returned while a single
+    background task retrieves a fresh one. When the status has been
+    invalidated or never retrieved, the callers wait for the same fetch.
+    Only boolean statuses are cached, errors are returned as they are.
+    """
+
+    def __init__(self, ttl: int, fetch: Callable[[], Awaitable[Any]]):
+        self.ttl: int = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self.refreshes: int = 0
+        self.invalidations: int = 0
+        self._fetch: Callable[[], Awaitable[Any]] = fetch
+        self._status: Optional[bool] = None
+        self._expires: float = 0.0
+        self._generation: int = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def get(self) -> Any:
+        """Return the cached status or retrieve it
+
+        :return: Return the status
+        :rtype: Any
+        """
+        if self._status is None:
+            self.misses += 1
+            return await asyncio.shield(self._refresh())
+        self.hits += 1
+        if monotonic() >= self._expires:
+            self._refresh()
+        return self._status
+
+    def set(self, status: Any) -> None:
+        """Store a fresh status
+
+        :param status: Status to store, non boolean values are ignored
+        :type status: Any
+        """
+        if isinstance(status, bool):
+            self._status = status
+            self._expires = monotonic() + self.ttl
+
+    def invalidate(self, _: Optional[Dict] = None) -> None:
+        """Forget the cached status, usable as a bus handler"""
+        self.invalidations += 1
+        self._generation += 1
+        self._status = None
+        self._expires = 0.0
+        self._task = None
+
+    def stats(self) -> Dict:
+        """Cache counters
+
+        :return: Return the cache status and counters
+        :rtype: dict
+        """
+        return {
+            "status": self._status,
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "invalidations": self.invalidations,
+        }
+
+    def _refresh(self) -> asyncio.Task:
+        """Start retrieving the status unless a retrieval is running
+
+        :return: Return the task retrieving the status
+        :rtype: asyncio.Task
+        """
+        if self._task is None or self._task.done():
+            self.refreshes += 1
+            # The retrieval is shared by every caller, it must not inherit
+            # the deadline of the caller starting it.
+            self._task = asyncio.create_task(self._run(), context=Context())
+            # Errors are raised to the callers waiting for the task, a
+            # background refresh has nobody to raise them to.
+            self._task.add_done_callback(
+                lambda task: task.cancelled() or task.exception()
+            )
+        return self._task
+
+    async def _run(self) -> Any:
+        """Retrieve and store the status
+
+        :return: Return the retrieved status
+        :rtype: Any
+        """
+        generation: int = self._generation
+        status: Any = await self._fetch()
+        # The status has been invalidated during the retrieval, the answer
+        # could be older than the event.
+        if generation == self._generation:
+            self.set(status)
+        return status
+
+
+class ResponseCache:
+    """Keep serialized responses during a TTL specific to each route.
+
+    Each response carries a strong `ETag` computed over its body, a request
+    with a matching `If-None-Match` header gets a HTTP 304 without any bus
+    round trip as long as the response is cached.
+
+    Concurrent misses of the same key wait for a single retrieval, a burst
+    of requests costs one bus round trip.
+
+    Keys are tuples starting with the route name, followed by the route
+    parameters.
+    """
+
+    def __init__(self):
+        self.hits: int = 0
+        self.misses: int = 0
+        self.shared: int = 0
+        self.not_modified: int = 0
+        self.invalidations: int = 0
+        self._entries: Dict[Tuple, Tuple[float, bytes, str]] = {}
+        self._fetches: Dict[Tuple, asyncio.Task] = {}
+        self._generation: int = 0
+
+    async def respond(
+        self,
+        request: Request,
+        key: Tuple,
+        ttl: int,
+        fetch: Callable[[], Awaitable[Any]],
+        sort: bool = False,
+    ) -> Response:
+        """Build the response from the cache or from `fetch`
+
+        :param request: Request to answer
+        :type request: Request
+        :param key: Cache key, the first item is the route name
+        :type key: tuple
+        :param ttl: Seconds to keep the response, `0` disables the cache
+        :type ttl: int
+        :param fetch: Coroutine function returning the response content
+        :type fetch: Callable
+        :param sort: Sort alphabetically the keys of the content
+        :type sort: bool
+        :return: Return a HTTP 200 or 304 response with an ETag
+        :rtype: Response
+        """
+        entry: Optional[Tuple[float, bytes, str]] = self._entries.get(key)
+        if entry is not None and entry[0] > monotonic():
+            self.hits += 1
+            body, etag = entry[1], entry[2]
+        else:
+            self.misses += 1
+            body, etag = await asyncio.shield(self._fetch(key, ttl, fetch, sort))
+        if self._match(request.headers.get("if-none-match"), etag):
+            self.not_modified += 1
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+            )
+        return Response(
+            content=body, media_type="application/json", headers={"ETag": etag}
+        )
+
+    def invalidate(self, *key: Any) -> None:
+        """Forget the responses whose key starts with the given items
+
+        :param key: Route name optionally followed by route parameters
+        :type key: Any
+        """
+        self.invalidations += 1
+        self._generation += 1
+        for cached in list(self._entries):
+            if cached[: len(key)] == key:
+                self._entries.pop(cached, None)
+        # The retrievals in progress may be older than the event, the next
+        # requests start a new one.
+        for fetching in list(self._fetches):
+            if fetching[: len(key)] == key:
+                self._fetches.pop(fetching, None)
+
+    def stats(self) -> Dict:
+        """Cache counters
+
+        :return: Return the cache size and counters
+        :rtype: dict
+        """
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared": self.shared,
+            "not_modified": self.not_modified,
+            "invalidations": self.invalidations,
+        }
+
+    def _fetch(
+        self,
+        key: Tuple,
+        ttl: int,
+        fetch: Callable[[], Awaitable[Any]],
+        sort: bool,
+    ) -> asyncio.Task:
+        """Start retrieving a response unless a retrieval of the same key is
+        running
+
+        :param key: Cache key, the first item is the route name
+        :type key: tuple
+        :param ttl: Seconds to keep the response, `0` disables the cache
+        :type ttl: int
+        :param fetch: Coroutine function returning the response content
+        :type fetch: Callable
+        :param sort: Sort alphabetically the keys of the content
+        :type sort: bool
+        :return: Return the task retrieving the body and its ETag
+        :rtype: asyncio.Task
+        """
+        task: Optional[asyncio.Task] = self._fetches.get(key)
+        if task is not None:
+            self.shared += 1
+            return task
+        # The retrieval is shared by every caller, it must not inherit the
+        # deadline of the caller starting it.
+        with unbounded():
+            task = asyncio.create_task(self._run(key, ttl, fetch, sort))
+        self._fetches[key] = task
+        task.add_done_callback(lambda done: self._fetched(key, done))
+        return task
+
+    def _fetched(self, key: Tuple, task: asyncio.Task) -> None:
+        """Forget a finished retrieval
+
+        :param key: Cache key of the retrieval
+        :type key: tuple
+        :param task: Task of the retrieval
+        :type task: asyncio.Task
+        """
+        if self._fetches.get(key) is task:
+            self._fetches.pop(key)
+        # Errors are raised to the callers waiting for the retrieval, the
+        # ones having left have nobody to raise them to.
+        if not task.cancelled():
+            task.exception()
+
+    async def _run(
+        self,
+        key: Tuple,
+        ttl: int,
+        fetch: Callable[[], Awaitable[Any]],
+        sort: bool,
+    ) -> Tuple[bytes, str]:
+        """Retrieve, serialize and store a response
+
+        :param key: Cache key, the first item is the route name
+        :type key: tuple
+        :param ttl: Seconds to keep the response, `0` disables the cache
+        :type ttl: int
+        :param fetch: Coroutine function returning the response content
+        :type fetch: Callable
+        :param sort: Sort alphabetically the keys of the content
+        :type sort: bool
+        :return: Return the body and its ETag
+        :rtype: tuple
+        """
+        generation: int = self._generation
+        body: bytes = response_class(sort)(content=await fetch()).body
+        etag: str = f'"{sha256(body).hexdigest()[:32]}"'
+        # The responses have been invalidated during the retrieval, the
+        # answer could be older than the event.
+        if ttl > 0 and generation == self._generation:
+            self._entries[key] = (monotonic() + ttl, body, etag)
+        return body, etag
+
+    @staticmethod
+    def _match(if_none_match: Optional[str], etag: str) -> bool:
+        """Check if the `If-None-Match` header matches the ETag
+
+        :param if_none_match: Value of the `If-None-Match` header
+        :type if_none_match: str, optional
+        :param etag: ETag of the response
+        :type etag: str
+        :return: Return True if the client already has the response
+        :rtype: bool
+        """
+        if not if_none_match:
+            return False
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
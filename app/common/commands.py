@@ -0,0 +1,136 @@
+"""Queue of the commands sent to the bus without waiting for an answer
+"""
+
+import asyncio
+import logging
+from contextvars import Context
+from time import perf_counter
+from typing import Dict, Optional, Tuple
+from fastapi import HTTPException, status
+from websockets.exceptions import WebSocketException
+from app.common import constants
+from app.common.bus import BusClient
+from app.common.metrics import metrics
+from app.common.tracing import request_id
+from app.common.typing import JSONStructure
+
+logger = logging.getLogger(__name__)
+
+
+class CommandQueue:
+    """Bounded queue of the fire-and-forget messages of a device.
+
+    The callers return as soon as their message is queued, a writer task
+    sends the messages over the bus connection of the device in the order
+    they have been queued.
+
+    When `size` messages are waiting, new ones are rejected with a HTTP 503
+    instead of piling up while the bus is slow or unreachable. The last
+    `reserved` places are kept for the control messages, a queue full of
+    utterances still accepts a stop.
+    """
+
+    def __init__(self, bus: BusClient, size: int, reserved: int = 0):
+        self.bus: BusClient = bus
+        self.size: int = size
+        self.reserved: int = min(reserved, size)
+        self.queued: int = 0
+        self.sent: int = 0
+        self.failed: int = 0
+        self.rejected: int = 0
+        self.drain_time: float = 0.0
+        self.drain_time_max: float = 0.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+
+    @property
+    def depth(self) -> int:
+        """Commands waiting to be sent
+
+        :return: Return the number of queued commands
+        :rtype: int
+        """
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def submit(self, payload: JSONStructure) -> None:
+        """Queue a message for the bus and start the writer task if needed
+
+        :param payload: JSON dict to send to the bus
+        :type payload: JSONStructure
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._writer is None or self._writer.done():
+            # The writer serves every request, it must not inherit the
+            # device, deadline or trace of the request starting it.
+            self._writer = asyncio.create_task(
+                self._drain(), name="bus-writer", context=Context()
+            )
+        if request_id():
+            payload = dict(payload)
+            payload["context"] = dict(payload.get("context") or {})
+            payload["context"][constants.BUS_REQUEST_ID] = request_id()
+        limit: int = (
+            self.size
+            if payload.get("type") in constants.BUS_CONTROL_TYPES
+            else self.size - self.reserved
+        )
+        if self.depth >= limit:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="too many commands waiting for the bus",
+                headers={"Retry-After": "1"},
+            )
+        self._queue.put_nowait((perf_counter(), payload))
+        self.queued += 1
+
+    async def close(self) -> None:
+        """Stop the writer task, the queued commands are dropped"""
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+        self._queue = None
+
+    def stats(self) -> Dict:
+        """Queue counters, durations are in seconds
+
+        :return: Return the queue status and counters
+        :rtype: dict
+        """
+        return {
+            "size": self.size,
+            "reserved": self.reserved,
+            "depth": self.depth,
+            "queued": self.queued,
+            "sent": self.sent,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "drain_time": self.drain_time,
+            "drain_time_max": self.drain_time_max,
+        }
+
+    async def _drain(self) -> None:
+        """Writer task, send the queued messages one after the other"""
+        while True:
+            item: Tuple[float, JSONStructure] = await self._queue.get()
+            submitted, payload = item
+            try:
+                await self.bus.send(payload)
+                self.sent += 1
+            except (WebSocketException, OSError):
+                self.failed += 1
+                logger.warning("unable to send %s to the bus", payload.get("type"))
+            except Exception:
+                # An unexpected error only loses its command, the writer
+                # keeps serving the queue.
+                self.failed += 1
+                logger.exception("unable to send %s to the bus", payload.get("type"))
+            waited: float = perf_counter() - submitted
+            self.drain_time += waited
+            self.drain_time_max = max(self.drain_time_max, waited)
+            metrics.observe("commands", waited, str(payload.get("type")))
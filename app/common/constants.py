@@ -14,3 +14,40 @@ SANITIZE_KEY_LIST: List = [
 ]
 JWT_SCOPES: Dict = {"access": "access", "refresh": "refresh"}
 JWT_ISSUER: str = "ovos-api"
+BUS_CONTEXT_ID: str = "ovos_api_id"
+BUS_ANY: str = "*"
+BUS_REQUEST_ID: str = "ovos_api_request_id"
+BUS_PROXY_ERROR: str = "ovos.api.proxy.error"
+# Data field identifying the answers not carrying back the context ID
+BUS_ANSWER_KEYS: Dict = {
+    "ovos.api.skill_settings.answer": "skill",
+    "ovos.api.cache.answer": "cache_type",
+}
+BUS_READ_ONLY_TYPES: List = [
+    "ovos.api.info",
+    "ovos.api.config",
+    "skillmanager.list",
+    "ovos.api.is_awake",
+    "ovos.api.internet",
+    "ovos.api.websocket",
+]
+STREAMING_ROUTES: List = ["/bus/events"]
+CONTROL_ROUTES: List = ["DELETE /voice/speech", "PUT /voice/microphone/mute"]
+BUS_CONTROL_TYPES: List = ["mycroft.stop", "mycroft.mic.mute"]
+DEFAULT_DEVICE: str = "default"
+DEVICE_HEADER: str = "x-ovos-device"
+SKILL_EVENTS: List = [
+    "skillmanager.activate",
+    "skillmanager.deactivate",
+    "mycroft.skills.loaded",
+    "mycroft.skills.shutdown",
+    "mycroft.skills.loading_failure",
+    "mycroft.skills.initialized",
+]
+SKILL_ACTIVE_EVENTS: List = ["skillmanager.activate", "mycroft.skills.loaded"]
+CONFIG_EVENTS: List = [
+    "configuration.updated",
+    "configuration.patch",
+    "configuration.patch.clear",
+]
+SKILL_SETTINGS_EVENTS: List = ["mycroft.skills.settings.changed"] + SKILL_EVENTS
@@ -0,0 +1,174 @@
+"""Time budget of the requests and cancellation of the abandoned ones
+"""
+
+import asyncio
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from fnmatch import translate
+from typing import Callable, Dict, Iterator, List, Optional, Pattern, Tuple
+from app.common import constants
+from app.common.metrics import metrics
+from app.config import get_settings
+
+settings = get_settings()
+
+# Status recorded for the requests abandoned by their client, nothing is
+# sent to the client since the connection is already closed.
+HTTP_CLIENT_CLOSED_REQUEST: int = 499
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+def parse_budgets(budgets: str) -> List[Tuple[Pattern, float]]:
+    """Parse a comma separated list of `route=seconds` budgets
+
+    :param budgets: Budgets such as `/system/config=8,/skills/*/settings=3`
+    :type budgets: str
+    :return: Return the route patterns and their budget in seconds
+    :rtype: list
+    """
+    parsed: List[Tuple[Pattern, float]] = []
+    for budget in budgets.split(","):
+        route, _, seconds = budget.strip().rpartition("=")
+        if route:
+            parsed.append((re.compile(translate(route)), float(seconds)))
+    return parsed
+
+
+ROUTE_BUDGETS: List[Tuple[Pattern, float]] = parse_budgets(settings.route_timeouts)
+
+
+def route_budget(route: str) -> float:
+    """Budget of a route, the first matching pattern wins
+
+    :param route: Path of the request without the version prefix
+    :type route: str
+    :return: Return the budget in seconds, `0` for no budget
+    :rtype: float
+    """
+    for pattern, seconds in ROUTE_BUDGETS:
+        if pattern.match(route):
+            return seconds
+    return settings.request_timeout
+
+
+@contextmanager
+def budget(seconds: float) -> Iterator[Optional[float]]:
+    """Limit the time spent by the bus interactions of a block of code, a
+    nested budget can only shorten the current one.
+
+    :param seconds: Seconds allowed, `0` keeps the current budget
+    :type seconds: float
+    :return: Return the loop time of the deadline, None if unlimited
+    :rtype: float, optional
+    """
+    token: Token = _deadline.set(expiry(seconds or None))
+    try:
+        yield _deadline.get()
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def unbounded() -> Iterator[None]:
+    """Lift the budget of the request for work shared with other requests,
+    the tasks created within the block are not limited by the deadline of
+    the request starting them.
+    """
+    token: Token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def expiry(timeout: Optional[float] = None) -> Optional[float]:
+    """Loop time at which a bus interaction gives up
+
+    :param timeout: Seconds allowed to the interaction, unlimited if not set
+    :type timeout: float, optional
+    :return: Return the earliest of the timeout and the request deadline,
+             None if both are unlimited
+    :rtype: float, optional
+    """
+    when: Optional[float] = _deadline.get()
+    if timeout is not None:
+        limit: float = asyncio.get_running_loop().time() + timeout
+        when = limit if when is None else min(when, limit)
+    return when
+
+
+class DeadlineMiddleware:
+    """ASGI middleware giving each HTTP request the budget of its route and
+    cancelling it as soon as the client disconnects.
+
+    The request messages are read by a watcher task and handed over to the
+    application, a disconnection before the response is complete cancels
+    the request and frees the bus waits. The streaming routes handle the
+    disconnection themselves and are left untouched.
+    """
+
+    def __init__(self, app: Callable):
+        self.app: Callable = app
+
+    async def __call__(self, scope: Dict, receive: Callable, send: Callable) -> None:
+        route: str = scope.get("path", "").removeprefix(settings.prefix_version)
+        if scope["type"] != "http" or route in constants.STREAMING_ROUTES:
+            await self.app(scope, receive, send)
+            return
+        messages: asyncio.Queue = asyncio.Queue()
+        started: bool = False
+        completed: bool = False
+
+        async def send_progress(message: Dict) -> None:
+            nonlocal started, completed
+            if message["type"] == "http.response.start":
+                started = True
+            elif message["type"] == "http.response.body":
+                completed = not message.get("more_body", False)
+            await send(message)
+
+        with budget(route_budget(route)):
+            request: asyncio.Task = asyncio.create_task(
+                self.app(scope, messages.get, send_progress)
+            )
+        watcher: asyncio.Task = asyncio.create_task(self._watch(receive, messages))
+        try:
+            await asyncio.wait({request, watcher}, return_when=asyncio.FIRST_COMPLETED)
+            if request.done() or completed:
+                await request
+                return
+            request.cancel()
+            try:
+                await request
+            except asyncio.CancelledError:
+                pass
+            metrics.http_cancelled += 1
+            if not started:
+                await send_progress(
+                    {
+                        "type": "http.response.start",
+                        "status": HTTP_CLIENT_CLOSED_REQUEST,
+                    }
+                )
+                await send_progress({"type": "http.response.body", "body": b""})
+        finally:
+            watcher.cancel()
+            request.cancel()
+
+    @staticmethod
+    async def _watch(receive: Callable, messages: asyncio.Queue) -> None:
+        """Watcher task, forward the request messages until the client
+        disconnects or the response is complete
+
+        :param receive: ASGI receive function of the server
+        :type receive: Callable
+        :param messages: Queue read by the application
+        :type messages: asyncio.Queue
+        """
+        while True:
+            message: Dict = await receive()
+            messages.put_nowait(message)
+            if message["type"] == "http.disconnect":
+                return
@@ -0,0 +1,269 @@
+"""OVOS core instances managed by the API
+"""
+
+import json
+import re
+from base64 import b64encode
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Callable, Dict, Iterator, List, Optional
+from fastapi import status
+from starlette.websockets import WebSocketClose
+from app.common import constants
+from app.common.bus import BusClient
+from app.common.cache import ResponseCache, StatusCache
+from app.common.commands import CommandQueue
+from app.common.metrics import metrics
+from app.common.registry import SkillRegistry
+from app.common.responses import ORJSONResponse
+from app.common.typing import JSONStructure
+from app.config import get_settings
+
+settings = get_settings()
+
+DEVICE_NAME: re.Pattern = re.compile(r"^[0-9A-Za-z._-]{1,64}$")
+
+
+def skill_status(skills: JSONStructure) -> bool:
+    """Checks if skill-rest-api is active within a `mycroft.skills.list`
+    message.
+
+    :param skills: Message containing the skill list
+    :type skills: JSONStructure
+    :return: Return the status of skill-rest-api
+    :rtype: bool
+    """
+    active: bool = False
+    for key in skills["data"]:
+        if (
+            skills["data"][key]["id"] == constants.API_SKILL_ID
+            and skills["data"][key]["active"]
+        ):
+            active = True
+    return active
+
+
+class Device:
+    """OVOS core instance and the state kept by the API about it.
+
+    Each device has its own bus connection, command queue, requirements
+    status, response cache and skill registry, the answers and events of a device never
+    reach the state of another one and a device slow to answer only
+    delays the requests sent to it.
+    """
+
+    def __init__(self, name: str, uri: str, app_key: str):
+        self.name: str = name
+        self.app_key: str = app_key
+        self.bus: BusClient = BusClient(uri=uri, timeout=settings.ws_conn_timeout)
+        self.commands: CommandQueue = CommandQueue(
+            self.bus, settings.commands_queue_size, settings.commands_reserved
+        )
+        self.requirements: StatusCache = StatusCache(
+            ttl=settings.requirements_ttl, fetch=self._fetch_requirements
+        )
+        self.responses: ResponseCache = ResponseCache()
+        self.registry: SkillRegistry = SkillRegistry(self.bus)
+        self.bus.on("mycroft.skills.list", self._skill_list_handler)
+        for skill_event in constants.SKILL_EVENTS:
+            self.bus.on(skill_event, self.requirements.invalidate)
+        for config_event in constants.CONFIG_EVENTS:
+            self.bus.on(config_event, self._config_handler)
+        for skill_settings_event in constants.SKILL_SETTINGS_EVENTS:
+            self.bus.on(skill_settings_event, self._skill_settings_handler)
+
+    async def _fetch_requirements(self) -> bool:
+        """Retrieves the skill list from the bus to check for requirements.
+
+        Without answer from the bus the status is unknown, the `KeyError`
+        is raised to the callers and nothing is cached.
+
+        :return: Return the status of the requirements
+        :rtype: bool
+        """
+        payload: dict = {
+            "type": "skillmanager.list",
+        }
+        skills: JSONStructure = await self.bus.request(
+            payload, "mycroft.skills.list", settings.ws_recv_timeout
+        )
+        return skill_status(skills)
+
+    def _skill_list_handler(self, message: JSONStructure) -> None:
+        """Refreshes the requirements status from skill lists seen on the bus.
+
+        :param message: `mycroft.skills.list` message
+        :type message: JSONStructure
+        """
+        try:
+            self.requirements.set(skill_status(message))
+        except (KeyError, TypeError):
+            pass
+
+    def _config_handler(self, _: JSONStructure) -> None:
+        """Forgets the cached responses built from the configuration.
+
+        :param _: Configuration event received from the bus
+        :type _: JSONStructure
+        """
+        self.responses.invalidate("system.info")
+        self.responses.invalidate("system.config")
+
+    def _skill_settings_handler(self, message: JSONStructure) -> None:
+        """Forgets the cached settings of a skill, or of every skill when the
+        event is not about a specific skill.
+
+        :param message: Skill event received from the bus
+        :type message: JSONStructure
+        """
+        data: dict = message.get("data") or {}
+        skill_id: Optional[str] = (
+            data.get("skill_id") or data.get("skill") or data.get("id")
+        )
+        if skill_id:
+            self.responses.invalidate("skills.settings", skill_id)
+        else:
+            self.responses.invalidate("skills.settings")
+
+
+def load_devices(path: str) -> Dict[str, Device]:
+    """Build the devices from the JSON database
+
+    The device configured with `WS_HOST`, `WS_PORT` and `API_KEY` is named
+    `default`, the database can declare a `default` device to replace it.
+
+    :param path: Path of the JSON database, empty for the default device only
+    :type path: str
+    :return: Return the devices indexed by their name
+    :rtype: dict
+    """
+    devices: Dict[str, Device] = {
+        constants.DEFAULT_DEVICE: Device(
+            constants.DEFAULT_DEVICE, settings.ws_uri, settings.app_key
+        )
+    }
+    if not path:
+        return devices
+    with open(path, encoding="utf-8") as data:
+        entries: List[Dict] = json.load(data)
+    declared: List[str] = []
+    for entry in entries:
+        name: str = str(entry.get("name", ""))
+        if not DEVICE_NAME.match(name) or name in declared:
+            raise ValueError(f"invalid or duplicated device name in {path}: {name}")
+        if not entry.get("host") or not entry.get("api_key"):
+            raise ValueError(f"device {name} requires a host and an api_key")
+        declared.append(name)
+        devices[name] = Device(
+            name,
+            f'ws://{entry["host"]}:{int(entry.get("port", 8181))}/core',
+            b64encode(str(entry["api_key"]).encode("utf-8")).decode("utf-8"),
+        )
+    return devices
+
+
+devices: Dict[str, Device] = load_devices(settings.devices_db)
+
+_device: ContextVar[Device] = ContextVar(
+    "device", default=devices[constants.DEFAULT_DEVICE]
+)
+
+
+def current() -> Device:
+    """Device the request being processed is sent to
+
+    :return: Return the selected device, the `default` one outside of a
+             request
+    :rtype: Device
+    """
+    return _device.get()
+
+
+@contextmanager
+def use(device: Device) -> Iterator[Device]:
+    """Send the requests of a block of code to a device, the tasks created
+    within the block inherit the device.
+
+    :param device: Device to send the requests to
+    :type device: Device
+    :return: Return the device
+    :rtype: Device
+    """
+    token: Token = _device.set(device)
+    try:
+        yield device
+    finally:
+        _device.reset(token)
+
+
+class DeviceMiddleware:
+    """ASGI middleware selecting the device of each HTTP and websocket
+    request.
+
+    The device is read from the `/v1/devices/{device}` path prefix, which
+    is removed before the routing, or from the `X-OVOS-Device` header. The
+    requests without device are sent to the `default` device, an unknown
+    device gets a HTTP 404.
+    """
+
+    def __init__(self, app: Callable):
+        self.app: Callable = app
+        self.prefix: str = f"{settings.prefix_version}/devices/"
+
+    async def __call__(self, scope: Dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        name: str = constants.DEFAULT_DEVICE
+        if scope["path"].startswith(self.prefix):
+            name, _, path = scope["path"][len(self.prefix) :].partition("/")
+            path = f"{settings.prefix_version}/{path}"
+            # The scope is updated in place like the router does, the outer
+            # middlewares read the matched route from it.
+            scope["path"] = path
+            scope["raw_path"] = path.encode("utf-8")
+        else:
+            header: bytes = dict(scope["headers"]).get(
+                constants.DEVICE_HEADER.encode("latin-1"), b""
+            )
+            name = header.decode("latin-1") or name
+        device: Optional[Device] = devices.get(name)
+        if device is None:
+            if scope["type"] == "websocket":
+                await WebSocketClose(
+                    code=status.WS_1008_POLICY_VIOLATION, reason="unknown device"
+                )(scope, receive, send)
+            else:
+                await ORJSONResponse(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    content={"detail": f"unknown device {name}"},
+                )(scope, receive, send)
+            return
+        with use(device):
+            await self.app(scope, receive, send)
+
+
+def _total(counter: str, component: str = "bus") -> Callable[[], int]:
+    """Sum of a counter over the devices
+
+    :param counter: Name of the counter attribute
+    :type counter: str
+    :param component: Device attribute holding the counter
+    :type component: str
+    :return: Return a function computing the sum
+    :rtype: Callable
+    """
+    return lambda: sum(
+        getattr(getattr(device, component), counter) for device in devices.values()
+    )
+
+
+metrics.count("bus_connections", _total("connects"))
+metrics.count("bus_matched", _total("matched"))
+metrics.count("bus_ignored", _total("ignored"))
+metrics.count("bus_timeouts", _total("timeouts"))
+metrics.count("bus_leaders", _total("leaders"))
+metrics.count("bus_coalesced", _total("coalesced"))
+metrics.gauge("bus_in_flight", _total("pending"))
+metrics.count("commands_rejected", _total("rejected", "commands"))
+metrics.gauge("commands_queued", _total("depth", "commands"))
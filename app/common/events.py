@@ -0,0 +1,213 @@
+"""Fan-out of the bus messages to the streaming clients
+"""
+
+import asyncio
+import re
+from collections import deque
+from fnmatch import translate
+from typing import Deque, Dict, List, Optional, Pattern, Set
+import orjson
+from app.common import constants
+from app.common.bus import BusClient
+from app.common.devices import current, devices
+from app.common.metrics import metrics
+from app.common.typing import JSONStructure
+from app.common.utils import sanitize
+from app.config import get_settings
+
+settings = get_settings()
+
+
+def compile_types(types: List[str]) -> Optional[Pattern]:
+    """Build a single regular expression from message type patterns
+
+    :param types: Message type patterns such as `recognizer_loop:*`
+    :type types: list
+    :return: Return the expression or None if there is no pattern
+    :rtype: Pattern, optional
+    """
+    if not types:
+        return None
+    return re.compile("|".join(translate(pattern) for pattern in types))
+
+
+class Subscription:
+    """Messages waiting to be delivered to a single client.
+
+    The queue is bounded, when the client does not keep up the oldest
+    messages are dropped to make room for the new ones.
+    """
+
+    __slots__ = ("types", "dropped", "_pattern", "_queue", "_ready")
+
+    def __init__(self, types: List[str], size: int):
+        self.types: List[str] = types
+        self.dropped: int = 0
+        self._pattern: Optional[Pattern] = compile_types(types)
+        self._queue: Deque[str] = deque(maxlen=size)
+        self._ready: asyncio.Event = asyncio.Event()
+
+    def match(self, message_type: str) -> bool:
+        """Check if the message type matches one of the type patterns
+
+        :param message_type: Type of the message received from the bus
+        :type message_type: str
+        :return: Return True if the client subscribed to this type
+        :rtype: bool
+        """
+        return self._pattern is None or self._pattern.match(message_type) is not None
+
+    def put(self, frame: str) -> bool:
+        """Queue an encoded message
+
+        :param frame: Message encoded as JSON
+        :type frame: str
+        :return: Return True if the oldest message has been dropped
+        :rtype: bool
+        """
+        dropped: bool = len(self._queue) == self._queue.maxlen
+        if dropped:
+            self.dropped += 1
+        self._queue.append(frame)
+        self._ready.set()
+        return dropped
+
+    async def get(self, timeout: Optional[float] = None) -> List[str]:
+        """Wait for messages and take all the queued ones, this allows to
+        write them at once to the client.
+
+        :param timeout: Seconds to wait for a message, forever if not set
+        :type timeout: float, optional
+        :return: Return the messages, empty if none arrived in time
+        :rtype: list
+        """
+        if not self._queue:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        frames: List[str] = list(self._queue)
+        self._queue.clear()
+        return frames
+
+
+class EventHub:
+    """Share a single subscription to the bus of a device between the
+    streaming clients.
+
+    The hub listens to the bus only while clients are subscribed, each
+    message is encoded once and only if at least one client subscribed to
+    its type, then the same frame is queued for every matching client.
+    """
+
+    def __init__(self, bus: BusClient, queue_size: int, max_clients: int):
+        self.bus: BusClient = bus
+        self.queue_size: int = queue_size
+        self.max_clients: int = max_clients
+        self.published: int = 0
+        self.dropped: int = 0
+        self.rejected: int = 0
+        self._subscriptions: Set[Subscription] = set()
+
+    def subscribe(self, types: List[str]) -> Optional[Subscription]:
+        """Register a client unless `max_clients` clients are already
+        registered, rejected attempts are counted
+
+        :param types: Message type patterns such as `recognizer_loop:*`,
+                      every message is delivered when empty
+        :type types: list
+        :return: Return the client subscription, None if the hub is full
+        :rtype: Subscription, optional
+        """
+        if len(self._subscriptions) >= self.max_clients:
+            self.rejected += 1
+            return None
+        if not self._subscriptions:
+            self.bus.on(constants.BUS_ANY, self._publish)
+        subscription: Subscription = Subscription(types, self.queue_size)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Unregister a client
+
+        :param subscription: Client subscription to remove
+        :type subscription: Subscription
+        """
+        self._subscriptions.discard(subscription)
+        if not self._subscriptions:
+            self.bus.remove(constants.BUS_ANY, self._publish)
+
+    def stats(self) -> Dict:
+        """Hub counters
+
+        :return: Return the number of clients and the counters
+        :rtype: dict
+        """
+        return {
+            "clients": len(self._subscriptions),
+            "published": self.published,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+        }
+
+    def _publish(self, message: JSONStructure) -> None:
+        """Queue a bus message for the clients subscribed to its type
+
+        :param message: Decoded message received from the bus
+        :type message: JSONStructure
+        """
+        message_type: str = str(message.get("type"))
+        subscriptions: List[Subscription] = [
+            subscription
+            for subscription in self._subscriptions
+            if subscription.match(message_type)
+        ]
+        if not subscriptions:
+            return
+        frame: str = orjson.dumps(_public(message)).decode()
+        self.published += 1
+        for subscription in subscriptions:
+            if subscription.put(frame):
+                self.dropped += 1
+
+
+def _public(message: JSONStructure) -> JSONStructure:
+    """Copy of the message without the API key and the sensitive data
+
+    :param message: Decoded message received from the bus
+    :type message: JSONStructure
+    :return: Return the message safe to share with the clients
+    :rtype: JSONStructure
+    """
+    data: Optional[Dict] = message.get("data")
+    if not isinstance(data, dict):
+        return message
+    data = {key: value for key, value in data.items() if key != "app_key"}
+    return {**message, "data": sanitize(data)}
+
+
+hubs: Dict[str, EventHub] = {
+    name: EventHub(
+        device.bus,
+        queue_size=settings.events_queue_size,
+        max_clients=settings.events_max_clients,
+    )
+    for name, device in devices.items()
+}
+
+
+def hub() -> EventHub:
+    """Hub of the device the request being processed is sent to
+
+    :return: Return the hub of the selected device
+    :rtype: EventHub
+    """
+    return hubs[current().name]
+
+
+metrics.gauge(
+    "event_clients",
+    lambda: sum(device_hub.stats()["clients"] for device_hub in hubs.values()),
+)
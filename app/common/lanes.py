@@ -0,0 +1,155 @@
+"""Priority lanes of the HTTP requests
+"""
+
+import asyncio
+from typing import Callable, Dict, List, Optional, Pattern, Tuple
+from fastapi import status
+from starlette.routing import compile_path
+from app.common import constants
+from app.common.deadline import expiry
+from app.common.devices import current, devices
+from app.common.metrics import metrics
+from app.common.responses import ORJSONResponse
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class RouteLanes:
+    """Limit the HTTP requests executed concurrently.
+
+    The requests beyond `concurrency` wait for a slot until their deadline
+    and are then rejected with a HTTP 503. The control routes such as stop
+    and mute never wait, they keep a low latency while slow configuration
+    or skill settings requests saturate the API. `0` disables the limit.
+
+    Each device has its own lanes, a device slow to answer only delays the
+    requests sent to it.
+    """
+
+    def __init__(self, concurrency: int):
+        self.concurrency: int = concurrency
+        self.running: int = 0
+        self.waiting: int = 0
+        self.control: int = 0
+        self.rejected: int = 0
+        self._slots: Optional[asyncio.Semaphore] = (
+            asyncio.Semaphore(concurrency) if concurrency > 0 else None
+        )
+
+    async def acquire(self) -> bool:
+        """Wait for an execution slot within the deadline of the request
+
+        :return: Return False if no slot has been available in time
+        :rtype: bool
+        """
+        if self._slots is None:
+            return True
+        self.waiting += 1
+        try:
+            async with asyncio.timeout_at(expiry()):
+                await self._slots.acquire()
+        except TimeoutError:
+            self.rejected += 1
+            return False
+        finally:
+            self.waiting -= 1
+        return True
+
+    def release(self) -> None:
+        """Give back an execution slot"""
+        if self._slots is not None:
+            self._slots.release()
+
+    def stats(self) -> Dict:
+        """Lanes counters
+
+        :return: Return the running and waiting requests and the counters
+        :rtype: dict
+        """
+        return {
+            "concurrency": self.concurrency,
+            "running": self.running,
+            "waiting": self.waiting,
+            "control": self.control,
+            "rejected": self.rejected,
+        }
+
+
+def compile_routes(routes: List[str]) -> List[Tuple[str, Pattern]]:
+    """Compile `METHOD /template` route declarations like the router does,
+    the templates can hold parameters such as `/skills/{skill_id}`
+
+    :param routes: Routes without the version prefix
+    :type routes: list
+    :return: Return the methods and the path patterns
+    :rtype: list
+    """
+    compiled: List[Tuple[str, Pattern]] = []
+    for route in routes:
+        method, _, template = route.partition(" ")
+        compiled.append((method, compile_path(settings.prefix_version + template)[0]))
+    return compiled
+
+
+CONTROL_ROUTES: List[Tuple[str, Pattern]] = compile_routes(constants.CONTROL_ROUTES)
+
+
+def control_route(scope: Dict) -> bool:
+    """Checks if a request targets a control route, the device prefix is
+    already removed from the path
+
+    :param scope: ASGI scope of the request
+    :type scope: dict
+    :return: Return True for the control routes
+    :rtype: bool
+    """
+    return any(
+        scope["method"] == method and pattern.match(scope["path"])
+        for method, pattern in CONTROL_ROUTES
+    )
+
+
+class LaneMiddleware:
+    """ASGI middleware running the HTTP requests within their lane.
+
+    The control routes are executed right away, the other ones once an
+    execution slot of the device is available. The streaming routes hold
+    their connection open and are left untouched. The control routes are
+    matched on their template once the device prefix has been removed.
+    """
+
+    def __init__(self, app: Callable):
+        self.app: Callable = app
+
+    async def __call__(self, scope: Dict, receive: Callable, send: Callable) -> None:
+        route: str = scope.get("path", "").removeprefix(settings.prefix_version)
+        if scope["type"] != "http" or route in constants.STREAMING_ROUTES:
+            await self.app(scope, receive, send)
+            return
+        device_lanes: RouteLanes = lanes[current().name]
+        if control_route(scope):
+            device_lanes.control += 1
+            await self.app(scope, receive, send)
+            return
+        if not await device_lanes.acquire():
+            await ORJSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={"detail": "too many requests in progress"},
+                headers={"Retry-After": "1"},
+            )(scope, receive, send)
+            return
+        device_lanes.running += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            device_lanes.running -= 1
+            device_lanes.release()
+
+
+lanes: Dict[str, RouteLanes] = {
+    name: RouteLanes(settings.route_concurrency) for name in devices
+}
+
+metrics.gauge("http_queued", lambda: sum(lane.waiting for lane in lanes.values()))
+metrics.count("http_rejected", lambda: sum(lane.rejected for lane in lanes.values()))
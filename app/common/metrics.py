@@ -0,0 +1,285 @@
+"""Prometheus metrics recorded without locking the request path
+"""
+
+import asyncio
+import os
+from collections import deque
+from time import perf_counter
+from typing import Callable, Deque, Dict, Optional, Tuple
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from app.config import get_settings
+
+settings = get_settings()
+
+MULTIPROCESS: bool = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+HISTOGRAMS: Dict[str, Histogram] = {
+    "http": Histogram(
+        "ovos_api_http_request_duration_seconds",
+        "HTTP request duration",
+        ["method", "route", "status"],
+    ),
+    "bus": Histogram(
+        "ovos_api_bus_round_trip_seconds",
+        "Duration between a bus request and its answer",
+        ["message", "outcome"],
+        buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    ),
+    "commands": Histogram(
+        "ovos_api_bus_command_wait_seconds",
+        "Time spent by a command in the queue before being sent to the bus",
+        ["message"],
+        buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0),
+    ),
+    "jwt": Histogram(
+        "ovos_api_jwt_verification_seconds",
+        "Access token verification duration",
+        ["cache"],
+        buckets=(0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05),
+    ),
+    "password_wait": Histogram(
+        "ovos_api_password_wait_seconds",
+        "Time spent by a password verification waiting for a thread",
+    ),
+    "password_hash": Histogram(
+        "ovos_api_password_hash_seconds",
+        "bcrypt password verification duration",
+        buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0),
+    ),
+}
+
+COUNTERS: Dict[str, Counter] = {
+    "bus_connections": Counter(
+        "ovos_api_bus_connections", "Bus connections opened by the API"
+    ),
+    "bus_matched": Counter(
+        "ovos_api_bus_matched_messages", "Bus messages routed to a waiting request"
+    ),
+    "bus_ignored": Counter(
+        "ovos_api_bus_ignored_messages", "Bus messages no request was waiting for"
+    ),
+    "bus_timeouts": Counter(
+        "ovos_api_bus_timeouts", "Bus requests without answer in time"
+    ),
+    "bus_leaders": Counter(
+        "ovos_api_bus_leader_requests",
+        "Read-only bus requests sent on behalf of identical concurrent ones",
+    ),
+    "bus_coalesced": Counter(
+        "ovos_api_bus_coalesced_requests",
+        "Read-only bus requests answered by an identical request in flight",
+    ),
+    "commands_rejected": Counter(
+        "ovos_api_bus_commands_rejected",
+        "Commands rejected because the queue of their device was full",
+    ),
+    "http_rejected": Counter(
+        "ovos_api_http_rejected_requests",
+        "HTTP requests rejected after waiting for an execution slot",
+    ),
+    "http_cancelled": Counter(
+        "ovos_api_http_cancelled_requests",
+        "HTTP requests cancelled because the client disconnected",
+    ),
+    "metrics_dropped": Counter(
+        "ovos_api_metrics_dropped_observations",
+        "Observations dropped because the buffer was full before a flush",
+    ),
+}
+
+GAUGES: Dict[str, Gauge] = {
+    "http_in_flight": Gauge(
+        "ovos_api_http_requests_in_flight",
+        "HTTP requests being processed",
+        multiprocess_mode="livesum",
+    ),
+    "http_queued": Gauge(
+        "ovos_api_http_requests_queued",
+        "HTTP requests waiting for an execution slot",
+        multiprocess_mode="livesum",
+    ),
+    "bus_in_flight": Gauge(
+        "ovos_api_bus_requests_in_flight",
+        "Bus requests waiting for their answer",
+        multiprocess_mode="livesum",
+    ),
+    "commands_queued": Gauge(
+        "ovos_api_bus_commands_queued",
+        "Commands waiting to be sent to the bus",
+        multiprocess_mode="livesum",
+    ),
+    "password_in_flight": Gauge(
+        "ovos_api_password_verifications_in_flight",
+        "Password verifications running or waiting for a thread",
+        multiprocess_mode="livesum",
+    ),
+    "event_clients": Gauge(
+        "ovos_api_event_clients",
+        "Clients streaming the bus messages",
+        multiprocess_mode="livesum",
+    ),
+}
+
+
+class Recorder:
+    """Buffer the observations and apply them to the Prometheus metrics.
+
+    Recording an observation only appends it to a bounded deque, a
+    periodic task and each scrape move the buffered observations to the
+    histograms. Counters and gauges are read from the counters already
+    maintained by the components through the registered functions.
+    """
+
+    def __init__(self, size: int):
+        self.http_in_flight: int = 0
+        self.http_cancelled: int = 0
+        self.dropped: int = 0
+        self._samples: Deque[Tuple[str, Tuple, float]] = deque(maxlen=size)
+        self._counters: Dict[str, Callable[[], int]] = {}
+        self._gauges: Dict[str, Callable[[], float]] = {}
+        self._flushed: Dict[str, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def observe(self, name: str, value: float, *labels: str) -> None:
+        """Record an observation of a histogram
+
+        :param name: Histogram name from `HISTOGRAMS`
+        :type name: str
+        :param value: Observed value, in seconds for the durations
+        :type value: float
+        :param labels: Label values of the histogram
+        :type labels: str
+        """
+        if len(self._samples) == self._samples.maxlen:
+            self.dropped += 1
+        self._samples.append((name, labels, value))
+
+    def count(self, name: str, total: Callable[[], int]) -> None:
+        """Feed a counter from a total maintained by a component
+
+        :param name: Counter name from `COUNTERS`
+        :type name: str
+        :param total: Function returning the current total
+        :type total: Callable
+        """
+        self._counters[name] = total
+
+    def gauge(self, name: str, value: Callable[[], float]) -> None:
+        """Feed a gauge from a value maintained by a component
+
+        :param name: Gauge name from `GAUGES`
+        :type name: str
+        :param value: Function returning the current value
+        :type value: Callable
+        """
+        self._gauges[name] = value
+
+    def stats(self) -> Dict:
+        """Recorder counters
+
+        :return: Return the buffered and dropped observations
+        :rtype: dict
+        """
+        return {"pending": len(self._samples), "dropped": self.dropped}
+
+    def flush(self) -> None:
+        """Apply the buffered observations, counters and gauges"""
+        while self._samples:
+            name, labels, value = self._samples.popleft()
+            histogram: Histogram = HISTOGRAMS[name]
+            (histogram.labels(*labels) if labels else histogram).observe(value)
+        for name, total in self._counters.items():
+            current: int = total()
+            if current > self._flushed.get(name, 0):
+                COUNTERS[name].inc(current - self._flushed.get(name, 0))
+            self._flushed[name] = current
+        for name, value in self._gauges.items():
+            GAUGES[name].set(value())
+
+    def render(self) -> bytes:
+        """Flush and export the metrics in the Prometheus text format, the
+        metrics of every worker are exported in multiprocess mode.
+
+        :return: Return the exposition
+        :rtype: bytes
+        """
+        self.flush()
+        if MULTIPROCESS:
+            registry: CollectorRegistry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+            return generate_latest(registry)
+        return generate_latest(REGISTRY)
+
+    def start(self) -> None:
+        """Start the periodic flush task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="metrics-flush")
+
+    async def stop(self) -> None:
+        """Stop the periodic flush task, in multiprocess mode the gauges
+        of this worker are removed.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if MULTIPROCESS:
+            multiprocess.mark_process_dead(os.getpid())
+
+    async def _run(self) -> None:
+        """Flush task, the metrics of a worker are visible to the other
+        workers once flushed.
+        """
+        while True:
+            await asyncio.sleep(settings.metrics_flush_interval)
+            self.flush()
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing the HTTP requests per route template"""
+
+    def __init__(self, app: Callable):
+        self.app: Callable = app
+
+    async def __call__(self, scope: Dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status_code: int = 500
+
+        async def send_status(message: Dict) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started: float = perf_counter()
+        metrics.http_in_flight += 1
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            metrics.http_in_flight -= 1
+            metrics.observe(
+                "http",
+                perf_counter() - started,
+                scope["method"],
+                getattr(scope.get("route"), "path", "unmatched"),
+                str(status_code),
+            )
+
+
+metrics: Recorder = Recorder(settings.metrics_buffer_size)
+metrics.gauge("http_in_flight", lambda: metrics.http_in_flight)
+metrics.count("http_cancelled", lambda: metrics.http_cancelled)
+metrics.count("metrics_dropped", lambda: metrics.dropped)
@@ -0,0 +1,140 @@
+"""In-process registry of the skills installed on OVOS core
+"""
+
+import asyncio
+from contextvars import Context
+from typing import Dict, Optional
+from app.common import constants
+from app.common.bus import BusClient
+from app.common.typing import JSONStructure
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class SkillRegistry:
+    """Skills indexed by their ID, populated once from `skillmanager.list`
+    and kept current by the skill events seen on the bus.
+
+    The registry is synchronized again when the bus connection has been
+    re-opened since events could have been missed in the meantime.
+    """
+
+    def __init__(self, bus: BusClient):
+        self.bus: BusClient = bus
+        self.resyncs: int = 0
+        self.updates: int = 0
+        self._skills: Dict[str, Dict] = {}
+        self._synced: bool = False
+        self._connects: int = 0
+        self._task: Optional[asyncio.Task] = None
+        bus.on("mycroft.skills.list", self._skill_list_handler)
+        for skill_event in constants.SKILL_EVENTS:
+            bus.on(skill_event, self.update)
+
+    @property
+    def synced(self) -> bool:
+        """Synchronization status
+
+        :return: Return True if the registry reflects the bus state
+        :rtype: bool
+        """
+        return self._synced and self._connects == self.bus.connects
+
+    async def lookup(self, skill_id: str) -> Optional[Dict]:
+        """Retrieve a skill by its ID
+
+        :param skill_id: Skill ID to look for
+        :type skill_id: str
+        :return: Return the skill `id` and `active` status if found
+        :rtype: dict, optional
+        """
+        if not self.synced:
+            await self.resync()
+        return self._skills.get(skill_id)
+
+    async def resync(self) -> int:
+        """Force the synchronization of the registry with the bus, the
+        concurrent callers share the same `skillmanager.list` request.
+
+        :return: Return the number of skills registered
+        :rtype: int
+        """
+        if self._task is None or self._task.done():
+            self.resyncs += 1
+            # The request is shared by every caller, it must not inherit
+            # the deadline, trace or device of the caller starting it.
+            self._task = asyncio.create_task(self._fetch(), context=Context())
+            self._task.add_done_callback(
+                lambda task: task.cancelled() or task.exception()
+            )
+        await asyncio.shield(self._task)
+        return len(self._skills)
+
+    def load(self, message: JSONStructure) -> None:
+        """Replace the registry content with a `mycroft.skills.list` message
+
+        :param message: Message containing the skill list
+        :type message: JSONStructure
+        """
+        skills: Dict[str, Dict] = {}
+        for skill in message["data"].values():
+            skills[skill["id"]] = {"id": skill["id"], "active": skill["active"]}
+        self._skills = skills
+        self._synced = True
+        self._connects = self.bus.connects
+        self.updates += 1
+
+    def update(self, message: JSONStructure) -> None:
+        """Apply a skill event to the registry
+
+        :param message: Skill event received from the bus
+        :type message: JSONStructure
+        """
+        data: Dict = message.get("data") or {}
+        skill_id: Optional[str] = data.get("skill") or data.get("id")
+        if not skill_id:
+            return
+        # Only a loaded skill could be missing from the registry, events
+        # about unknown skills are ignored.
+        if skill_id not in self._skills and message["type"] != "mycroft.skills.loaded":
+            return
+        self._skills[skill_id] = {
+            "id": skill_id,
+            "active": message["type"] in constants.SKILL_ACTIVE_EVENTS,
+        }
+        self.updates += 1
+
+    def stats(self) -> Dict:
+        """Registry counters
+
+        :return: Return the registry status and counters
+        :rtype: dict
+        """
+        return {
+            "synced": self.synced,
+            "count": len(self._skills),
+            "resyncs": self.resyncs,
+            "updates": self.updates,
+        }
+
+    async def _fetch(self) -> None:
+        """Request the skill list and load it, an invalid or missing
+        answer raises an exception.
+        """
+        payload: Dict = {"type": "skillmanager.list"}
+        skills: JSONStructure = await self.bus.request(
+            payload, "mycroft.skills.list", settings.ws_recv_timeout
+        )
+        self.load(skills)
+
+    def _skill_list_handler(self, message: JSONStructure) -> None:
+        """Loads the skill lists seen on the bus.
+
+        :param message: `mycroft.skills.list` message
+        :type message: JSONStructure
+        """
+        try:
+            self.load(message)
+        except (KeyError, TypeError, AttributeError):
+            pass
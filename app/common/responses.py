@@ -0,0 +1,46 @@
+"""JSON responses serialized by orjson
+"""
+
+from typing import Any
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized by orjson, used as the default response
+    class of the application.
+
+    The output is the same compact JSON as `JSONResponse`, dictionaries
+    with non string keys are supported as well.
+    """
+
+    option: int = orjson.OPT_NON_STR_KEYS
+
+    def render(self, content: Any) -> bytes:
+        """Serialize the content
+
+        :param content: Content of the response
+        :type content: Any
+        :return: Return the JSON document
+        :rtype: bytes
+        """
+        return orjson.dumps(content, option=self.option)
+
+
+class SortedORJSONResponse(ORJSONResponse):
+    """JSON response with the keys sorted alphabetically at every level,
+    the sort happens while serializing, the content is not copied.
+    """
+
+    option: int = orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS
+
+
+def response_class(sort: bool = False) -> type:
+    """Response class matching the `sort` query parameter
+
+    :param sort: Sort alphabetically the keys
+    :type sort: bool
+    :return: Return the response class to use
+    :rtype: type
+    """
+    return SortedORJSONResponse if sort else ORJSONResponse
@@ -0,0 +1,351 @@
+"""Lightweight request tracing exported in the OTLP/JSON format
+"""
+
+import asyncio
+import re
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from secrets import token_hex
+from time import time_ns
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+from urllib.request import Request, urlopen
+import orjson
+from app.config import get_settings
+
+settings = get_settings()
+
+SPAN_KIND_INTERNAL: int = 1
+SPAN_KIND_SERVER: int = 2
+SPAN_KIND_CLIENT: int = 3
+
+TRACEPARENT: re.Pattern = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+REQUEST_ID: re.Pattern = re.compile(r"^[0-9A-Za-z._-]{1,64}$")
+
+_span: ContextVar[Optional["Span"]] = ContextVar("span", default=None)
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+class Span:
+    """Timed operation of a trace"""
+
+    __slots__ = (
+        "name",
+        "kind",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "start",
+        "end",
+        "attributes",
+        "error",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        kind: int,
+        trace_id: str,
+        parent_id: Optional[str] = None,
+    ):
+        self.name: str = name
+        self.kind: int = kind
+        self.trace_id: str = trace_id
+        self.span_id: str = token_hex(8)
+        self.parent_id: Optional[str] = parent_id
+        self.start: int = time_ns()
+        self.end: int = 0
+        self.attributes: Dict[str, Any] = {}
+        self.error: bool = False
+
+    def set(self, key: str, value: Any) -> None:
+        """Set an attribute of the span
+
+        :param key: Attribute name such as `bus.message`
+        :type key: str
+        :param value: Attribute value, a string, number or boolean
+        :type value: Any
+        """
+        self.attributes[key] = value
+
+    def export(self) -> Dict:
+        """Span in the OTLP/JSON format
+
+        :return: Return the span ready to be encoded
+        :rtype: dict
+        """
+        span: Dict = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start),
+            "endTimeUnixNano": str(self.end),
+            "attributes": [
+                _attribute(key, value) for key, value in self.attributes.items()
+            ],
+            "status": {"code": 2 if self.error else 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class _NoopSpan:
+    """Span returned when the request is not traced"""
+
+    def set(self, key: str, value: Any) -> None:
+        """Ignore the attribute"""
+
+
+NOOP_SPAN: _NoopSpan = _NoopSpan()
+
+
+class Tracer:
+    """Record the spans of the HTTP requests and export them in batches.
+
+    Tracing is enabled when a file or an OTLP/HTTP collector endpoint is
+    configured. Finished spans are appended to a bounded deque, a periodic
+    task encodes them once in the OTLP/JSON format and writes them from a
+    thread, a full buffer drops the oldest spans.
+    """
+
+    def __init__(self, path: str, endpoint: str, size: int):
+        self.path: str = path
+        self.endpoint: str = endpoint
+        self.enabled: bool = bool(path or endpoint)
+        self.exported: int = 0
+        self.dropped: int = 0
+        self.failures: int = 0
+        self._spans: Deque[Span] = deque(maxlen=size)
+        self._task: Optional[asyncio.Task] = None
+
+    @contextmanager
+    def span(
+        self, name: str, kind: int = SPAN_KIND_INTERNAL, **attributes: Any
+    ) -> Iterator[Span]:
+        """Time a block of code as a child of the current span, nothing is
+        recorded outside of a traced request.
+
+        :param name: Span name such as `bus.request`
+        :type name: str
+        :param kind: OTLP span kind
+        :type kind: int
+        :param attributes: Initial attributes of the span
+        :type attributes: Any
+        :return: Return the span to set attributes on
+        :rtype: Span
+        """
+        parent: Optional[Span] = _span.get()
+        if parent is None:
+            yield NOOP_SPAN
+            return
+        span: Span = Span(name, kind, parent.trace_id, parent.span_id)
+        span.attributes.update(attributes)
+        token: Token = _span.set(span)
+        try:
+            yield span
+        except BaseException:
+            span.error = True
+            raise
+        finally:
+            _span.reset(token)
+            self.finish(span)
+
+    def finish(self, span: Span) -> None:
+        """End a span and queue it for the export
+
+        :param span: Span to end
+        :type span: Span
+        """
+        span.end = time_ns()
+        if len(self._spans) == self._spans.maxlen:
+            self.dropped += 1
+        self._spans.append(span)
+
+    def stats(self) -> Dict:
+        """Tracer counters
+
+        :return: Return the tracer status and counters
+        :rtype: dict
+        """
+        return {
+            "enabled": self.enabled,
+            "pending": len(self._spans),
+            "exported": self.exported,
+            "dropped": self.dropped,
+            "failures": self.failures,
+        }
+
+    async def flush(self) -> None:
+        """Export the finished spans"""
+        spans: List[Span] = []
+        while self._spans:
+            spans.append(self._spans.popleft())
+        if not spans:
+            return
+        body: bytes = orjson.dumps(
+            {
+                "resourceSpans": [
+                    {
+                        "resource": {
+                            "attributes": [_attribute("service.name", "ovos-api")]
+                        },
+                        "scopeSpans": [
+                            {
+                                "scope": {"name": __name__},
+                                "spans": [span.export() for span in spans],
+                            }
+                        ],
+                    }
+                ]
+            }
+        )
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._write, body)
+            self.exported += len(spans)
+        except (OSError, ValueError):
+            self.failures += 1
+
+    def start(self) -> None:
+        """Start the periodic export task"""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="tracing-export")
+
+    async def stop(self) -> None:
+        """Stop the periodic export task and export the remaining spans"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def _write(self, body: bytes) -> None:
+        """Write a batch to the file, one batch per line, and send it to
+        the collector
+
+        :param body: Batch of spans encoded in the OTLP/JSON format
+        :type body: bytes
+        """
+        if self.path:
+            with open(self.path, "ab") as export:
+                export.write(body + b"\n")
+        if self.endpoint:
+            request: Request = Request(
+                self.endpoint,
+                data=body,
+                headers={"Content-Type": "application/json"},
+                method="POST",
+            )
+            with urlopen(request, timeout=settings.ws_conn_timeout):
+                pass
+
+    async def _run(self) -> None:
+        """Export task"""
+        while True:
+            await asyncio.sleep(settings.tracing_flush_interval)
+            await self.flush()
+
+
+class TracingMiddleware:
+    """ASGI middleware opening the root span of each HTTP request.
+
+    The request ID is read from the `X-Request-ID` header or is the trace
+    ID, it is returned within the `X-Request-ID` header and added to the
+    context of the messages sent to the bus. A W3C `traceparent` header
+    continues the trace of the caller.
+    """
+
+    def __init__(self, app: Callable):
+        self.app: Callable = app
+
+    async def __call__(self, scope: Dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers: Dict[bytes, bytes] = dict(scope["headers"])
+        parent: Optional[re.Match] = TRACEPARENT.match(
+            headers.get(b"traceparent", b"").decode("latin-1")
+        )
+        trace_id: str = parent.group(1) if parent else token_hex(16)
+        request_id: str = headers.get(b"x-request-id", b"").decode("latin-1")
+        if not REQUEST_ID.match(request_id):
+            request_id = trace_id
+        span: Optional[Span] = None
+        if tracer.enabled:
+            span = Span(
+                scope["method"],
+                SPAN_KIND_SERVER,
+                trace_id,
+                parent.group(2) if parent else None,
+            )
+            span.set("http.method", scope["method"])
+            span.set("http.target", scope["path"])
+            span.set("request.id", request_id)
+        status_code: int = 500
+
+        async def send_request_id(message: Dict) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-request-id", request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        request_token: Token = _request_id.set(request_id)
+        span_token: Token = _span.set(span)
+        try:
+            await self.app(scope, receive, send_request_id)
+        except BaseException:
+            if span is not None:
+                span.error = True
+            raise
+        finally:
+            _span.reset(span_token)
+            _request_id.reset(request_token)
+            if span is not None:
+                route: str = getattr(scope.get("route"), "path", scope["path"])
+                span.name = f'{scope["method"]} {route}'
+                span.set("http.route", route)
+                span.set("http.status_code", status_code)
+                span.error = span.error or status_code >= 500
+                tracer.finish(span)
+
+
+def request_id() -> Optional[str]:
+    """ID of the request being processed
+
+    :return: Return the request ID if called while serving a request
+    :rtype: str, optional
+    """
+    return _request_id.get()
+
+
+def _attribute(key: str, value: Any) -> Dict:
+    """Attribute in the OTLP/JSON format
+
+    :param key: Attribute name
+    :type key: str
+    :param value: Attribute value
+    :type value: Any
+    :return: Return the typed attribute
+    :rtype: dict
+    """
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+tracer: Tracer = Tracer(
+    path=settings.tracing_file,
+    endpoint=settings.tracing_endpoint,
+    size=settings.tracing_buffer_size,
+)
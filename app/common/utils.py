@@ -1,22 +1,23 @@
 """Functions use multiple times in different places across the application
 """
 
-import json
-from typing import List, Optional, Dict
-from time import time
-from websocket import create_connection, WebSocketException, WebSocketTimeoutException
+from typing import List, Optional
+from websockets.exceptions import WebSocketException
 from app.config import get_settings
 from app.common import constants
+from app.common.devices import current
+from app.common.tracing import tracer
 from app.common.typing import JSONStructure
 
 settings = get_settings()
 
 
-def ws_send(
+async def ws_send(
     payload: JSONStructure, wait_for_message: Optional[str] = None
 ) -> JSONStructure:
-    """Handles websocket interactions, from the connection,
-    the send/receive message and the closing.
+    """Handles websocket interactions by using the bus connection of the
+    selected device, the answers are routed by the bus reader to the
+    waiting callers.
 
     :param payload: JSON dict to send to the bus
     :type payload: dict
@@ -25,68 +26,34 @@ def ws_send(
     :return: Return the received message or and empty dict if nothing to retrun
     :rtype: JSONStructure
     """
-    websocket = None
     try:
-        websocket = create_connection(
-            url=settings.ws_uri, timeout=settings.ws_conn_timeout
-        )
-    except WebSocketTimeoutException as err:
-        return err
-
-    try:
-        # If message is expected as answer then we enter in a loop. The loop
-        # will timeout after 3 seconds if no message equal to wait_for_message
-        # is received.
+        # If message is expected as answer then we wait for it. The wait
+        # will timeout after `ws_recv_timeout` seconds if no message equal
+        # to wait_for_message is received.
         if wait_for_message:
-            timeout_start: float = time()
-            data: Dict = {}
-            websocket.send(json.dumps(payload))
-            while time() < timeout_start + settings.ws_recv_timeout:
-                recv: JSONStructure = json.loads(websocket.recv())
-                if recv["type"] == wait_for_message and recv["data"]:
-                    data = recv
-                    break
-                # Check for authentication if required.
-                if (
-                    recv["type"] == wait_for_message
-                    and not recv["context"]["authenticated"]
-                ):
-                    data = recv
-                    break
-            websocket.close()
-            return data
+            return await current().bus.request(
+                payload, wait_for_message, settings.ws_recv_timeout
+            )
 
         # Send message without wait for message and return an empty JSON dict.
-        websocket.send(json.dumps(payload))
-        websocket.close()
+        await current().bus.send(payload)
         return {}
-    except WebSocketException as err:
-        websocket.close()
+    except (WebSocketException, OSError) as err:
         return err
 
 
-def requirements() -> bool:
+async def requirements() -> bool:
     """Checks for requirements such as skill-restart-api which will
     retrieve local information from Mycroft core instance.
 
+    The status is cached for `requirements_ttl` seconds and forgotten as
+    soon as a skill is loaded, activated or deactivated.
+
     :return: Return the status of the requirements
     :rtype: bool
     """
-    try:
-        payload: dict = {
-            "type": "skillmanager.list",
-        }
-        skills: JSONStructure = ws_send(payload, "mycroft.skills.list")
-        status: bool = False
-        for key in skills["data"]:
-            if (
-                skills["data"][key]["id"] == constants.API_SKILL_ID
-                and skills["data"][key]["active"]
-            ):
-                status = True
-        return status
-    except KeyError as err:
-        return err
+    with tracer.span("requirements"):
+        return await current().requirements.get()
 
 
 def sanitize(data: JSONStructure) -> JSONStructure:
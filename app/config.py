@@ -17,14 +17,43 @@ class Settings(BaseSettings):
     app_key: str = b64encode(config("API_KEY").encode("utf-8"))
     cryto_scheme: str = "bcrypt"
     users_db: str = config("USERS_DB")
+    devices_db: str = config("DEVICES_DB", "")
+    fleet_timeout: float = config("FLEET_TIMEOUT", 5.0, cast=float)
     prefix_version: str = "/v1"
     ws_uri: str = f'ws://{config("WS_HOST", "127.0.0.1")}:{config("WS_PORT", 8181)}/core'
     ws_conn_timeout: int = 10
-    ws_recv_timeout: int = 5
+    ws_recv_timeout: float = config("WS_RECV_TIMEOUT", 5.0, cast=float)
+    request_timeout: float = config("REQUEST_TIMEOUT", 10.0, cast=float)
+    route_timeouts: str = config("ROUTE_TIMEOUTS", "")
+    requirements_ttl: int = config("REQUIREMENTS_TTL", 60, cast=int)
+    cache_ttl_info: int = config("CACHE_TTL_INFO", 30, cast=int)
+    cache_ttl_config: int = config("CACHE_TTL_CONFIG", 30, cast=int)
+    cache_ttl_skill_settings: int = config("CACHE_TTL_SKILL_SETTINGS", 30, cast=int)
     jwt_algorithm: str = "HS256"
     jwt_secret: str = config("SECRET")
     jwt_access_expiration: int = 1800
     jwt_refresh_expiration: int = 21600
+    jwt_cache_size: int = config("JWT_CACHE_SIZE", 1024, cast=int)
+    auth_workers: int = config("AUTH_WORKERS", 2, cast=int)
+    auth_queue_size: int = config("AUTH_QUEUE_SIZE", 8, cast=int)
+    batch_max_operations: int = config("BATCH_MAX_OPERATIONS", 32, cast=int)
+    commands_queue_size: int = config("COMMANDS_QUEUE_SIZE", 64, cast=int)
+    commands_reserved: int = config("COMMANDS_RESERVED", 8, cast=int)
+    route_concurrency: int = config("ROUTE_CONCURRENCY", 64, cast=int)
+    events_queue_size: int = config("EVENTS_QUEUE_SIZE", 100, cast=int)
+    events_max_clients: int = config("EVENTS_MAX_CLIENTS", 256, cast=int)
+    events_keepalive: int = config("EVENTS_KEEPALIVE", 15, cast=int)
+    metrics_flush_interval: int = config("METRICS_FLUSH_INTERVAL", 5, cast=int)
+    metrics_buffer_size: int = config("METRICS_BUFFER_SIZE", 10000, cast=int)
+    metrics_token: str = config("METRICS_TOKEN", "")
+    tracing_file: str = config("TRACING_FILE", "")
+    tracing_endpoint: str = config("TRACING_ENDPOINT", "")
+    tracing_flush_interval: int = config("TRACING_FLUSH_INTERVAL", 5, cast=int)
+    tracing_buffer_size: int = config("TRACING_BUFFER_SIZE", 10000, cast=int)
+    bus_publish_types: str = config(
+        "BUS_PUBLISH_TYPES", "speak,recognizer_loop:utterance,mycroft.stop"
+    )
+    bus_proxy_recheck: int = config("BUS_PROXY_RECHECK", 60, cast=int)
     hide_sensitive_data: bool = True
 
 
@@ -3,9 +3,9 @@
 
 from fastapi import HTTPException, status
 from app.auth.bearer import JWTBearer
+from app.auth.pool import password_pool
 from app.auth.handlers import (
     get_user,
-    verify_password,
     encode_access_jwt,
     encode_refresh_jwt,
     refresh_jwt,
@@ -17,20 +17,23 @@ from app.models.auth import Tokens, User, AccessToken
 settings = get_settings()
 
 
-def tokens(info: User) -> JSONStructure:
+async def tokens(info: User) -> JSONStructure:
     """Generate access and refresh tokens
 
+    The password is verified within the password pool, if the pool is
+    full then the request is rejected with a HTTP 429.
+
     :param info: User and password information
     :type info: User
     :return: Return access and refresh tokens
     :rtype: JSONStructure
     """
     user = get_user(info.user)
-    if user is None:
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid user"
         )
-    if not verify_password(info.password, user["password"]):
+    if not await password_pool.verify(info.password, user["password"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid password"
         )
@@ -45,7 +48,7 @@ def tokens(info: User) -> JSONStructure:
     return payload
 
 
-def refresh(refresh_token: str) -> JSONStructure:
+async def refresh(refresh_token: str) -> JSONStructure:
     """Generate access token based on a refresh token
 
     :param refresh_token: Refresh token
@@ -0,0 +1,137 @@
+"""Handles batch requirements
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from app.config import get_settings
+from app.handlers import network, skills, system, voice
+from app.models.batch import Batch, BatchResults, Operation, OperationResult
+from app.models.system import Cache
+from app.models.voice import Speak
+
+settings = get_settings()
+
+
+def _dialog(params: Dict) -> Optional[Speak]:
+    """Build the optional confirmation message of sleep and wake up
+
+    :param params: Operation parameters
+    :type params: dict
+    :return: Return the confirmation message if any
+    :rtype: Speak, optional
+    """
+    if params.get("dialog"):
+        return Speak(**params["dialog"])
+    return None
+
+
+# Operation name mapped to the handler to call with the operation parameters
+# and the HTTP status code returned by the equivalent route.
+OPERATIONS: Dict[str, Tuple[Callable[[Dict], Awaitable], int]] = {
+    "network.ping": (lambda params: network.ping(), status.HTTP_200_OK),
+    "network.internet": (lambda params: network.internet(), status.HTTP_200_OK),
+    "network.websocket": (lambda params: network.websocket(), status.HTTP_200_OK),
+    "skills.retrieve_settings": (
+        lambda params: skills.retrieve_settings(params["skill_id"]),
+        status.HTTP_200_OK,
+    ),
+    "skills.activate": (
+        lambda params: skills.activate(params["skill_id"]),
+        status.HTTP_202_ACCEPTED,
+    ),
+    "skills.deactivate": (
+        lambda params: skills.deactivate(params["skill_id"]),
+        status.HTTP_202_ACCEPTED,
+    ),
+    "system.get_info": (lambda params: system.get_info(), status.HTTP_200_OK),
+    "system.get_config": (lambda params: system.get_config(), status.HTTP_200_OK),
+    "system.sleep": (
+        lambda params: system.sleep(params.get("confirm", False), _dialog(params)),
+        status.HTTP_201_CREATED,
+    ),
+    "system.wake_up": (
+        lambda params: system.wake_up(params.get("confirm", False), _dialog(params)),
+        status.HTTP_201_CREATED,
+    ),
+    "system.is_awake": (lambda params: system.is_awake(), status.HTTP_200_OK),
+    "system.caching": (
+        lambda params: system.caching(Cache(**params)),
+        status.HTTP_201_CREATED,
+    ),
+    "voice.speaking": (
+        lambda params: voice.speaking(Speak(**params)),
+        status.HTTP_202_ACCEPTED,
+    ),
+    "voice.stop": (lambda params: voice.stop(), status.HTTP_202_ACCEPTED),
+    "voice.mute": (lambda params: voice.mute(), status.HTTP_202_ACCEPTED),
+    "voice.unmute": (lambda params: voice.unmute(), status.HTTP_202_ACCEPTED),
+    "voice.listen": (lambda params: voice.listen(), status.HTTP_202_ACCEPTED),
+}
+
+
+async def execute(operation: Operation) -> OperationResult:
+    """Execute a single operation of a batch
+
+    Errors are returned as the operation result instead of being raised,
+    a failing operation does not fail the other ones.
+
+    :param operation: Operation to execute
+    :type operation: Operation
+    :return: Return the operation status code and content
+    :rtype: OperationResult
+    """
+    result: Dict = {"id": operation.id, "operation": operation.operation}
+    if operation.operation not in OPERATIONS:
+        return {
+            **result,
+            "status_code": status.HTTP_404_NOT_FOUND,
+            "content": {"detail": f"operation {operation.operation} not found"},
+        }
+    handler, status_code = OPERATIONS[operation.operation]
+    try:
+        content: Any = await handler(operation.params)
+    except HTTPException as err:
+        return {
+            **result,
+            "status_code": err.status_code,
+            "content": {"detail": err.detail},
+        }
+    except (KeyError, TypeError, ValidationError):
+        return {
+            **result,
+            "status_code": status.HTTP_422_UNPROCESSABLE_ENTITY,
+            "content": {"detail": "invalid operation parameters"},
+        }
+    # Handlers without content return the HTTP status code
+    if isinstance(content, int):
+        return {**result, "status_code": content, "content": None}
+    return {**result, "status_code": status_code, "content": content}
+
+
+async def run(batch: Batch) -> BatchResults:
+    """Execute a batch of operations
+
+    Operations are executed concurrently over the bus unless `ordered`
+    is set, then they are executed one after the other.
+
+    :param batch: Operations to execute
+    :type batch: Batch
+    :return: Return the result of each operation in the request order
+    :rtype: BatchResults
+    """
+    if len(batch.operations) > settings.batch_max_operations:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"batch is limited to {settings.batch_max_operations} operations",
+        )
+    results: List[OperationResult] = []
+    if batch.ordered:
+        for operation in batch.operations:
+            results.append(await execute(operation))
+    else:
+        results = await asyncio.gather(
+            *[execute(operation) for operation in batch.operations]
+        )
+    return {"results": results}
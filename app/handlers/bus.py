@@ -0,0 +1,245 @@
+"""Handles bus requirements
+"""
+
+import asyncio
+from time import time
+from typing import AsyncIterator, Dict, List, Optional, Pattern
+import orjson
+from fastapi import HTTPException, WebSocket, WebSocketDisconnect, status
+from websockets.exceptions import WebSocketException
+from app.auth.bearer import JWTBearer
+from app.auth.handlers import decode_jwt
+from app.common import constants
+from app.common.events import EventHub, Subscription, compile_types, hub
+from app.common.typing import JSONStructure
+from app.common.utils import ws_send
+from app.config import get_settings
+
+settings = get_settings()
+
+
+def parse_types(types: Optional[str]) -> List[str]:
+    """Split a comma separated list of message type patterns
+
+    :param types: Message type patterns such as `speak,recognizer_loop:*`
+    :type types: str, optional
+    :return: Return the patterns, empty to match every message
+    :rtype: list
+    """
+    return [pattern.strip() for pattern in (types or "").split(",") if pattern.strip()]
+
+
+# Message types the proxy clients are allowed to send to the bus
+PUBLISH_TYPES: Optional[Pattern] = compile_types(
+    parse_types(settings.bus_publish_types)
+)
+
+
+async def events(types: Optional[str] = None) -> AsyncIterator[str]:
+    """Stream the bus messages as Server-Sent Events
+
+    Every client shares the same bus subscription, a client not reading
+    fast enough loses its oldest messages instead of slowing down the
+    other ones.
+
+    :param types: Message type patterns such as `speak,recognizer_loop:*`
+    :type types: str, optional
+    :return: Return the event stream
+    :rtype: AsyncIterator
+    """
+    device_hub: EventHub = hub()
+    subscription: Optional[Subscription] = device_hub.subscribe(parse_types(types))
+    if subscription is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="too many clients are streaming the bus messages",
+        )
+    stream: AsyncIterator[str] = _stream(device_hub, subscription)
+    # Once started, the stream unsubscribes the client when it is closed or
+    # garbage collected, even if the response is never sent.
+    first: str = await stream.__anext__()
+    return _resume(first, stream)
+
+
+async def _resume(first: str, stream: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Send the first event of a started stream, then the next ones
+
+    :param first: Event already read from the stream
+    :type first: str
+    :param stream: Started event stream
+    :type stream: AsyncIterator
+    :return: Return the event stream
+    :rtype: AsyncIterator
+    """
+    try:
+        yield first
+        async for event in stream:
+            yield event
+    finally:
+        await stream.aclose()
+
+
+async def _stream(
+    device_hub: EventHub, subscription: Subscription
+) -> AsyncIterator[str]:
+    """Format the messages of a hub subscription as events, a comment is
+    sent when the bus is quiet to keep the connection open.
+
+    :param device_hub: Hub of the device to stream the messages of
+    :type device_hub: EventHub
+    :param subscription: Client subscription, removed once the stream ends
+    :type subscription: Subscription
+    :return: Return the event stream
+    :rtype: AsyncIterator
+    """
+    try:
+        try:
+            await device_hub.bus.connect()
+        except (WebSocketException, OSError):
+            pass
+        yield ": connected\n\n"
+        while True:
+            frames: List[str] = await subscription.get(settings.events_keepalive)
+            if not frames:
+                yield ": keepalive\n\n"
+                continue
+            yield "".join(f"data: {frame}\n\n" for frame in frames)
+    finally:
+        device_hub.unsubscribe(subscription)
+
+
+async def proxy(
+    websocket: WebSocket, token: Optional[str], types: Optional[str]
+) -> None:
+    """Relay the bus messages to a websocket client and the client messages
+    to the bus
+
+    The access token is read from the `token` parameter or from the
+    `Authorization` header. The client receives the messages matching its
+    type patterns and is only allowed to send the message types matching
+    `BUS_PUBLISH_TYPES`, other messages are answered with an error.
+
+    The connection is closed once the token expires or its user is
+    disabled, and when the client sends a binary frame.
+
+    :param websocket: Client websocket, not accepted yet
+    :type websocket: WebSocket
+    :param token: Access token
+    :type token: str, optional
+    :param types: Message type patterns such as `speak,recognizer_loop:*`
+    :type types: str, optional
+    """
+    authorization: str = websocket.headers.get("authorization", "")
+    if not token and authorization.startswith("Bearer "):
+        token = authorization[len("Bearer ") :]
+    try:
+        if not token or not JWTBearer.verify_access_jwt(token):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+    except Exception:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    device_hub: EventHub = hub()
+    subscription: Optional[Subscription] = device_hub.subscribe(parse_types(types))
+    if subscription is None:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+    writer: Optional[asyncio.Task] = None
+    guard: Optional[asyncio.Task] = None
+    try:
+        await websocket.accept()
+        writer = asyncio.create_task(_relay(websocket, subscription))
+        guard = asyncio.create_task(_guard(websocket, token))
+        try:
+            await device_hub.bus.connect()
+        except (WebSocketException, OSError):
+            pass
+        while True:
+            message: Dict = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            raw: Optional[str] = message.get("text")
+            if raw is None:
+                await websocket.close(code=status.WS_1003_UNSUPPORTED_DATA)
+                break
+            error: Optional[str] = await _publish(raw)
+            if error:
+                await websocket.send_text(
+                    orjson.dumps(
+                        {"type": constants.BUS_PROXY_ERROR, "data": {"error": error}}
+                    ).decode()
+                )
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        for task in (writer, guard):
+            if task is not None:
+                task.cancel()
+        device_hub.unsubscribe(subscription)
+
+
+async def _guard(websocket: WebSocket, token: str) -> None:
+    """Watcher task, close the connection once the access token expired or
+    its user has been disabled
+
+    The token is checked again at its expiry and every `BUS_PROXY_RECHECK`
+    seconds in between.
+
+    :param websocket: Client websocket
+    :type websocket: WebSocket
+    :param token: Access token of the client
+    :type token: str
+    """
+    expires: float = decode_jwt(token)["exp"]
+    while True:
+        await asyncio.sleep(max(0.0, min(settings.bus_proxy_recheck, expires - time())))
+        try:
+            valid: bool = JWTBearer.verify_access_jwt(token)
+        except Exception:
+            valid = False
+        if not valid:
+            try:
+                await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            except (RuntimeError, OSError):
+                pass
+            return
+
+
+async def _relay(websocket: WebSocket, subscription: Subscription) -> None:
+    """Writer task, send the queued bus messages to the client
+
+    :param websocket: Client websocket
+    :type websocket: WebSocket
+    :param subscription: Client subscription
+    :type subscription: Subscription
+    """
+    try:
+        while True:
+            for frame in await subscription.get():
+                await websocket.send_text(frame)
+    except (WebSocketDisconnect, RuntimeError, OSError):
+        pass
+
+
+async def _publish(raw: str) -> Optional[str]:
+    """Send a client message to the bus
+
+    :param raw: Message received from the client
+    :type raw: str
+    :return: Return the error if the message has not been sent
+    :rtype: str, optional
+    """
+    try:
+        message: JSONStructure = orjson.loads(raw)
+        message_type: str = message["type"]
+        data: Dict = message.get("data") or {}
+        context: Dict = message.get("context") or {}
+        if not isinstance(message_type, str) or not isinstance(data, dict):
+            raise TypeError
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return "invalid message"
+    if PUBLISH_TYPES is None or not PUBLISH_TYPES.match(message_type):
+        return f"message type {message_type} is not allowed"
+    payload: Dict = {"type": message_type, "data": data, "context": context}
+    if isinstance(await ws_send(payload), Exception):
+        return "unable to send the message to the bus"
+    return None
@@ -0,0 +1,27 @@
+"""Handles devices requirements
+"""
+
+from fastapi import HTTPException, status
+from app.common.devices import devices
+from app.models.devices import Devices
+
+
+async def retrieve_list() -> Devices:
+    """Retrieve the devices managed by the API and their bus connection
+    status
+
+    :return: Return the devices sorted by name
+    :rtype: Devices
+    """
+    try:
+        return {
+            "devices": [
+                {"name": name, "connected": devices[name].bus.connected}
+                for name in sorted(devices)
+            ]
+        }
+    except Exception as err:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="unable to retrieve the devices",
+        ) from err
@@ -0,0 +1,108 @@
+"""Handles fleet requirements
+"""
+
+import asyncio
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from fastapi import HTTPException, status
+from app.common.devices import Device, devices, use
+from app.config import get_settings
+from app.handlers import network, system
+from app.models.fleet import DeviceResult, FleetResults
+
+settings = get_settings()
+
+
+async def query(device: Device, handler: Callable[[], Awaitable]) -> DeviceResult:
+    """Call a handler for a single device within the fleet deadline
+
+    Errors are returned as the device result instead of being raised, a
+    failing or slow device does not fail the other ones.
+
+    :param device: Device to query
+    :type device: Device
+    :param handler: Handler of the equivalent device route
+    :type handler: Callable
+    :return: Return the device status code, content and duration
+    :rtype: DeviceResult
+    """
+    started: float = perf_counter()
+    result: Dict = {"status_code": status.HTTP_200_OK}
+    with use(device):
+        try:
+            result["content"] = await asyncio.wait_for(
+                handler(), settings.fleet_timeout
+            )
+        except asyncio.TimeoutError:
+            result["status_code"] = status.HTTP_504_GATEWAY_TIMEOUT
+            result["content"] = {"detail": "device did not answer in time"}
+        except HTTPException as err:
+            result["status_code"] = err.status_code
+            result["content"] = {"detail": err.detail}
+    result["elapsed"] = round(perf_counter() - started, 3)
+    return result
+
+
+async def fan_out(
+    handler: Callable[[], Awaitable], names: Optional[str] = None
+) -> FleetResults:
+    """Call a handler for every device concurrently
+
+    Each device has `fleet_timeout` seconds to answer, the results are
+    returned as soon as every device answered or ran out of time.
+
+    :param handler: Handler of the equivalent device route
+    :type handler: Callable
+    :param names: Comma separated list of devices, every device if not set
+    :type names: str, optional
+    :return: Return the result of each device
+    :rtype: FleetResults
+    """
+    selected: List[str] = (
+        [name.strip() for name in names.split(",") if name.strip()]
+        if names
+        else sorted(devices)
+    )
+    unknown: List[str] = [name for name in selected if name not in devices]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"unknown device {', '.join(unknown)}",
+        )
+    results: List[Any] = await asyncio.gather(
+        *[query(devices[name], handler) for name in selected]
+    )
+    return {"results": dict(zip(selected, results))}
+
+
+async def get_info(names: Optional[str] = None) -> FleetResults:
+    """Retrieves the system information of the devices
+
+    :param names: Comma separated list of devices, every device if not set
+    :type names: str, optional
+    :return: Return the information of each device
+    :rtype: FleetResults
+    """
+    return await fan_out(system.get_info, names)
+
+
+async def is_awake(names: Optional[str] = None) -> FleetResults:
+    """Retrieves the sleep mode status of the devices
+
+    :param names: Comma separated list of devices, every device if not set
+    :type names: str, optional
+    :return: Return the sleep mode status of each device
+    :rtype: FleetResults
+    """
+    return await fan_out(system.is_awake, names)
+
+
+async def internet(names: Optional[str] = None) -> FleetResults:
+    """Retrieves the Internet connection status of the devices
+
+    :param names: Comma separated list of devices, every device if not set
+    :type names: str, optional
+    :return: Return the connectivity status of each device
+    :rtype: FleetResults
+    """
+    return await fan_out(network.internet, names)
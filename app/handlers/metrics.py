@@ -0,0 +1,20 @@
+"""Handles metrics requirements
+"""
+
+from fastapi import HTTPException, status
+from app.common.metrics import metrics
+
+
+async def collect() -> bytes:
+    """Export the metrics in the Prometheus text format
+
+    :return: Return the metrics exposition
+    :rtype: bytes
+    """
+    try:
+        return metrics.render()
+    except Exception as err:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="unable to collect the metrics",
+        ) from err
@@ -4,6 +4,7 @@
 from random import choice
 from typing import List
 from fastapi import HTTPException, status
+from app.common.devices import current
 from app.common.utils import ws_send, requirements
 from app.common.typing import JSONStructure
 from app.config import get_settings
@@ -11,7 +12,7 @@ from app.config import get_settings
 settings = get_settings()
 
 
-def ping() -> JSONStructure:
+async def ping() -> JSONStructure:
     """Get the API status
 
     :return: Return famous ping pong players
@@ -36,7 +37,7 @@ def ping() -> JSONStructure:
         ) from err
 
 
-def internet() -> JSONStructure:
+async def internet() -> JSONStructure:
     """Get Internet connection status
 
     :return: Return Internet connectivity status as boolean
@@ -48,11 +49,11 @@ def internet() -> JSONStructure:
         payload = {
             "type": "ovos.api.internet",
             "data": {
-                "app_key": settings.app_key,
+                "app_key": current().app_key,
             },
         }
-        if requirements():
-            internet: JSONStructure = ws_send(payload, "ovos.api.internet.answer")
+        if await requirements():
+            internet: JSONStructure = await ws_send(payload, "ovos.api.internet.answer")
             if internet["context"]["authenticated"]:
                 return {"connected": internet["data"]["status"]}
             status_code = status.HTTP_401_UNAUTHORIZED
@@ -65,7 +66,7 @@ def internet() -> JSONStructure:
         raise HTTPException(status_code=status_code, detail=msg) from err
 
 
-def websocket() -> JSONStructure:
+async def websocket() -> JSONStructure:
     """Get websocket connection status
 
     :return: Return websocket connection status as boolean
@@ -77,11 +78,13 @@ def websocket() -> JSONStructure:
         payload = {
             "type": "ovos.api.websocket",
             "data": {
-                "app_key": settings.app_key,
+                "app_key": current().app_key,
             },
         }
-        if requirements():
-            websocket: JSONStructure = ws_send(payload, "ovos.api.websocket.answer")
+        if await requirements():
+            websocket: JSONStructure = await ws_send(
+                payload, "ovos.api.websocket.answer"
+            )
             if websocket["context"]["authenticated"]:
                 return {"listening": websocket["data"]["listening"]}
             status_code = status.HTTP_401_UNAUTHORIZED
@@ -1,26 +1,24 @@
 """Handles skills requirements
 """
 
-import json
-from typing import Optional, Dict
+from typing import Dict, Optional
 from fastapi import HTTPException, status
 from app.common.typing import JSONStructure
 from app.models.skills import Skills, Install, Uninstall
 from app.common.utils import ws_send, requirements, sanitize
+from app.common.devices import current
 from app.config import get_settings
 from app.common.constants import API_SKILL_ID
 
 settings = get_settings()
 
 
-def retrieve_list(sort: Optional[bool] = False) -> Skills:
+async def retrieve_list() -> Skills:
     """Retrieve skill list by leveraging skill-rest-api
 
     Send `skillmanager.list` message and wait for `mycroft.skills.list`
     message to appear on the bus.
 
-    :param sort: Sort alphabetically the skills
-    :type sort: bool, optional
     :return: Return the skill list
     :rtype: JSONStructure
     """
@@ -28,7 +26,7 @@ def retrieve_list(sort: Optional[bool] = False) -> Skills:
         payload = {
             "type": "skillmanager.list",
         }
-        skills: JSONStructure = ws_send(payload, "mycroft.skills.list")
+        skills: JSONStructure = await ws_send(payload, "mycroft.skills.list")
 
         active: int = 0
         inactive: int = 0
@@ -37,8 +35,6 @@ def retrieve_list(sort: Optional[bool] = False) -> Skills:
                 active = active + 1
             else:
                 inactive = inactive + 1
-        if sort:
-            skills = json.loads(json.dumps(skills, sort_keys=True))
         data: Skills = {
             "count": len(skills["data"]),
             "count_active": active,
@@ -53,11 +49,12 @@ def retrieve_list(sort: Optional[bool] = False) -> Skills:
         ) from err
 
 
-def retrieve_settings(skill_id: str) -> JSONStructure:
+async def retrieve_settings(skill_id: str) -> JSONStructure:
     """Retrieves skill's settings by leveraging skill-rest-api
 
-    Send `skillmanager.list` message and wait for `mycroft.skills.list`
-    message to appear on the bus.
+    The skill is looked up within the skill registry, then send
+    `ovos.api.skill_settings` message and wait for
+    `ovos.api.skill_settings.answer` message to appear on the bus.
 
     :param skill_id: Skill ID to retrieve the settings
     :type skill_id: str
@@ -67,23 +64,23 @@ def retrieve_settings(skill_id: str) -> JSONStructure:
     status_code: int = status.HTTP_400_BAD_REQUEST
     msg: str = "unable to retrieve skill settings"
     try:
-        skills: Skills = retrieve_list()
-        for key in skills["results"]:
-            if skills["results"][key]["id"] == skill_id:
-                payload: Dict = {
-                    "type": "ovos.api.skill_settings",
-                    "data": {"app_key": settings.app_key, "skill": skill_id},
-                }
-                info: JSONStructure = ws_send(payload, "ovos.api.skill_settings.answer")
-                if requirements():
-                    if info["context"]["authenticated"]:
-                        return sanitize({"results": info["data"]})
-                    status_code = status.HTTP_401_UNAUTHORIZED
-                    msg = "unable to authenticate with skill-rest-api"
-                    raise Exception
+        if await current().registry.lookup(skill_id):
+            payload: Dict = {
+                "type": "ovos.api.skill_settings",
+                "data": {"app_key": current().app_key, "skill": skill_id},
+            }
+            info: JSONStructure = await ws_send(
+                payload, "ovos.api.skill_settings.answer"
+            )
+            if await requirements():
+                if info["context"]["authenticated"]:
+                    return sanitize({"results": info["data"]})
                 status_code = status.HTTP_401_UNAUTHORIZED
-                msg = "skill-rest-api is not installed on ovos core"
+                msg = "unable to authenticate with skill-rest-api"
                 raise Exception
+            status_code = status.HTTP_401_UNAUTHORIZED
+            msg = "skill-rest-api is not installed on ovos core"
+            raise Exception
         status_code = status.HTTP_404_NOT_FOUND
         msg = f"skill {skill_id} not found"
         raise Exception
@@ -91,58 +88,76 @@ def retrieve_settings(skill_id: str) -> JSONStructure:
         raise HTTPException(status_code=status_code, detail=msg) from err
 
 
-def deactivate(skill_id: str) -> int:
+async def deactivate(skill_id: str) -> int:
     """Deactivate a skill
 
-    Send `skillmanager.deactivate` message with the skill ID as payload.
+    Queue `skillmanager.deactivate` message for the bus with the skill ID as
+    payload once the skill is known to exist.
 
     :param skill_id: Skill ID to deactivate
     :type skill_id: str
-    :return: Return HTTP 204 or 400
+    :return: Return HTTP 202, 400 or 503
     :rtype: int
     """
     try:
-        skills: JSONStructure = retrieve_list()
-        for key in skills["results"]:
-            if skills["results"][key]["id"] == skill_id:
-                payload = {
-                    "type": "skillmanager.deactivate",
-                    "data": {"skill": skill_id},
-                }
-                ws_send(payload)
-                return status.HTTP_204_NO_CONTENT
-        return status.HTTP_400_BAD_REQUEST
+        found: Optional[Dict] = await current().registry.lookup(skill_id)
     except Exception as err:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="unable to deactivate skill"
         ) from err
+    if not found:
+        return status.HTTP_400_BAD_REQUEST
+    payload: Dict = {
+        "type": "skillmanager.deactivate",
+        "data": {"skill": skill_id},
+    }
+    current().commands.submit(payload)
+    return status.HTTP_202_ACCEPTED
 
 
-def activate(skill_id: str) -> int:
+async def activate(skill_id: str) -> int:
     """Activate a skill
 
-    Send `skillmanager.activate` message with the skill ID as payload.
+    Queue `skillmanager.activate` message for the bus with the skill ID as
+    payload once the skill is known to exist.
 
     :param skill_id: Skill ID to activate
     :type skill_id: str
-    :return: Return HTTP 204 or 400
+    :return: Return HTTP 202, 400 or 503
     :rtype: int
     """
     try:
-        skills: JSONStructure = retrieve_list()
-        for key in skills["results"]:
-            if skills["results"][key]["id"] == skill_id:
-                payload: Dict = {
-                    "type": "skillmanager.activate",
-                    "data": {"skill": skill_id},
-                }
-                ws_send(payload)
-                return status.HTTP_204_NO_CONTENT
-        return status.HTTP_400_BAD_REQUEST
+        found: Optional[Dict] = await current().registry.lookup(skill_id)
     except Exception as err:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="unable to activate skill"
         ) from err
+    if not found:
+        return status.HTTP_400_BAD_REQUEST
+    payload: Dict = {
+        "type": "skillmanager.activate",
+        "data": {"skill": skill_id},
+    }
+    current().commands.submit(payload)
+    return status.HTTP_202_ACCEPTED
+
+
+async def resync() -> JSONStructure:
+    """Force the skill registry synchronization
+
+    Send `skillmanager.list` message and wait for `mycroft.skills.list`
+    message to appear on the bus.
+
+    :return: Return the number of skills registered
+    :rtype: JSONStructure
+    """
+    try:
+        return {"count": await current().registry.resync()}
+    except Exception as err:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="unable to synchronize skill registry",
+        ) from err
 
 
 # def update() -> int:
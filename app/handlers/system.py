@@ -1,27 +1,34 @@
 """Handles systems requirements
 """
 
-import json
-from typing import Dict, Optional
+import asyncio
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from fastapi import HTTPException, status
 from app.common.typing import JSONStructure
-from app.models.system import InfoResults, Cache, Config
+from app.models.system import InfoResults, Cache, Config, Overview, Section, Stats
 from app.models.voice import Speak
 from app.common.utils import ws_send, requirements, sanitize
+from app.auth.bearer import token_cache
+from app.auth.pool import password_pool
+from app.common.devices import Device, current
+from app.common.events import hub
+from app.common.lanes import lanes
+from app.common.metrics import metrics
+from app.common.tracing import tracer
 from app.config import get_settings
+from app.handlers import network, skills
 from app.handlers.voice import speaking
 
 settings = get_settings()
 
 
-def get_info(sort: Optional[bool] = False) -> InfoResults:
+async def get_info() -> InfoResults:
     """Retrieves system information by leveraging the skill-rest-api
 
     Send `"ovos.api.info` message and wait for `ovos.api.info.answer`
     message to appear on the bus.
 
-    :param sort: Sort alphabetically the information
-    :type sort: bool, optional
     :return: Return information
     :rtype: InfoResults
     """
@@ -30,13 +37,11 @@ def get_info(sort: Optional[bool] = False) -> InfoResults:
     try:
         payload: Dict = {
             "type": "ovos.api.info",
-            "data": {"app_key": settings.app_key},
+            "data": {"app_key": current().app_key},
         }
-        if requirements():
-            info: JSONStructure = ws_send(payload, "ovos.api.info.answer")
+        if await requirements():
+            info: JSONStructure = await ws_send(payload, "ovos.api.info.answer")
             if info["context"]["authenticated"]:
-                if sort:
-                    info = json.loads(json.dumps(info, sort_keys=True))
                 return {"results": info["data"]}
             status_code = status.HTTP_401_UNAUTHORIZED
             msg = "unable to authenticate with skill-rest-api"
@@ -48,14 +53,12 @@ def get_info(sort: Optional[bool] = False) -> InfoResults:
         raise HTTPException(status_code=status_code, detail=msg) from err
 
 
-def get_config(sort: Optional[bool] = False) -> Config:
+async def get_config() -> Config:
     """Retrieves local or core configuration by leveraging skill-rest-api
 
     Send `"ovos.api.config` message and wait for `ovos.api.config.answer`
     message to appear on the bus.
 
-    :param sort: Sort alphabetically the configuration
-    :type sort: bool, optional
     :return: Return configuration
     :rtype: Config
     """
@@ -64,13 +67,11 @@ def get_config(sort: Optional[bool] = False) -> Config:
     try:
         payload: Dict = {
             "type": "ovos.api.config",
-            "data": {"app_key": settings.app_key},
+            "data": {"app_key": current().app_key},
         }
-        if requirements():
-            config: JSONStructure = ws_send(payload, "ovos.api.config.answer")
+        if await requirements():
+            config: JSONStructure = await ws_send(payload, "ovos.api.config.answer")
             if config["context"]["authenticated"]:
-                if sort:
-                    config = json.loads(json.dumps(config, sort_keys=True))
                 return sanitize(config["data"])
             status_code = status.HTTP_401_UNAUTHORIZED
             msg = "unable to authenticate with skill-rest-api"
@@ -82,7 +83,9 @@ def get_config(sort: Optional[bool] = False) -> Config:
         raise HTTPException(status_code=status_code, detail=msg) from err
 
 
-def sleep(confirm: Optional[bool] = True, dialog: Optional[Speak] = None) -> Speak:
+async def sleep(
+    confirm: Optional[bool] = True, dialog: Optional[Speak] = None
+) -> Speak:
     """Put OVOS into sleep mode
 
     Send `recognizer_loop:sleep` message to the bus.
@@ -99,14 +102,14 @@ def sleep(confirm: Optional[bool] = True, dialog: Optional[Speak] = None) -> Spe
     try:
         payload: Dict = {
             "type": "recognizer_loop:sleep",
-            "data": {"app_key": settings.app_key},
+            "data": {"app_key": current().app_key},
         }
-        if requirements():
-            sleep: JSONStructure = ws_send(payload, "ovos.api.sleep.answer")
+        if await requirements():
+            sleep: JSONStructure = await ws_send(payload, "ovos.api.sleep.answer")
             if sleep["context"]["authenticated"]:
                 if confirm and dialog:
                     payload = Speak(utterance=dialog.utterance, lang=dialog.lang)
-                    return speaking(payload)
+                    return await speaking(payload)
                 return {"sleep_mode": "enabled"}
             status_code = status.HTTP_401_UNAUTHORIZED
             msg = "unable to authenticate with skill-rest-api"
@@ -118,7 +121,9 @@ def sleep(confirm: Optional[bool] = True, dialog: Optional[Speak] = None) -> Spe
         raise HTTPException(status_code=status_code, detail=msg) from err
 
 
-def wake_up(confirm: Optional[bool] = True, dialog: Optional[Speak] = None) -> Speak:
+async def wake_up(
+    confirm: Optional[bool] = True, dialog: Optional[Speak] = None
+) -> Speak:
     """Wake up OVOS from sleep mode
 
     Send `recognizer_loop:wake_up` message to the bus.
@@ -135,14 +140,14 @@ def wake_up(confirm: Optional[bool] = True, dialog: Optional[Speak] = None) -> S
     try:
         payload: Dict = {
             "type": "recognizer_loop:wake_up",
-            "data": {"app_key": settings.app_key},
+            "data": {"app_key": current().app_key},
         }
-        wake_up: JSONStructure = ws_send(payload, "ovos.api.wake_up.answer")
-        if requirements():
+        wake_up: JSONStructure = await ws_send(payload, "ovos.api.wake_up.answer")
+        if await requirements():
             if wake_up["context"]["authenticated"]:
                 if confirm and dialog:
                     payload: Speak = Speak(utterance=dialog.utterance, lang=dialog.lang)
-                    return speaking(payload)
+                    return await speaking(payload)
                 return {"sleep_mode": "disabled"}
             status_code = status.HTTP_401_UNAUTHORIZED
             msg = "unable to authenticate with skill-rest-api"
@@ -153,7 +158,7 @@ def wake_up(confirm: Optional[bool] = True, dialog: Optional[Speak] = None) -> S
         raise HTTPException(status_code=status_code, detail=msg) from err
 
 
-def is_awake() -> JSONStructure:
+async def is_awake() -> JSONStructure:
     """Retrieve sleep mode status by leveraging the skill-rest-api
 
     Send `mycroft.api.is_awake` message and wait for
@@ -167,10 +172,10 @@ def is_awake() -> JSONStructure:
     try:
         payload = {
             "type": "ovos.api.is_awake",
-            "data": {"app_key": settings.app_key},
+            "data": {"app_key": current().app_key},
         }
-        if requirements():
-            info: JSONStructure = ws_send(payload, "ovos.api.is_awake.answer")
+        if await requirements():
+            info: JSONStructure = await ws_send(payload, "ovos.api.is_awake.answer")
             if info["context"]["authenticated"]:
                 return info["data"]
             status_code = status.HTTP_401_UNAUTHORIZED
@@ -183,7 +188,7 @@ def is_awake() -> JSONStructure:
         raise HTTPException(status_code=status_code, detail=msg) from err
 
 
-def caching(cache: Cache) -> JSONStructure:
+async def caching(cache: Cache) -> JSONStructure:
     """Delete cached files by leveraging the kill-rest-api
 
     Send `ovos.api.cache` message to the bus.
@@ -197,10 +202,10 @@ def caching(cache: Cache) -> JSONStructure:
         data: Cache = Cache(cache_type=cache.cache_type)
         payload: Dict = {
             "type": "ovos.api.cache",
-            "data": {"app_key": settings.app_key, "cache_type": data.cache_type},
+            "data": {"app_key": current().app_key, "cache_type": data.cache_type},
         }
-        if requirements():
-            cache: JSONStructure = ws_send(payload, "ovos.api.cache.answer")
+        if await requirements():
+            cache: JSONStructure = await ws_send(payload, "ovos.api.cache.answer")
             if cache["context"]["authenticated"]:
                 return cache["data"]
             status_code = status.HTTP_401_UNAUTHORIZED
@@ -211,3 +216,84 @@ def caching(cache: Cache) -> JSONStructure:
         raise Exception
     except Exception as err:
         raise HTTPException(status_code=status_code, detail=msg) from err
+
+
+async def stats() -> Stats:
+    """Retrieve the API internal statistics
+
+    The bus connection, command queue, caches, registry and event counters
+    are the ones of the selected device.
+
+    :return: Return the bus connection, caches, registry and pool counters
+    :rtype: Stats
+    """
+    try:
+        device: Device = current()
+        return {
+            "bus": device.bus.stats(),
+            "commands": device.commands.stats(),
+            "lanes": lanes[device.name].stats(),
+            "requirements": device.requirements.stats(),
+            "responses": device.responses.stats(),
+            "registry": device.registry.stats(),
+            "tokens": token_cache.stats(),
+            "passwords": password_pool.stats(),
+            "events": hub().stats(),
+            "metrics": metrics.stats(),
+            "tracing": tracer.stats(),
+        }
+    except Exception as err:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="unable to retrieve statistics",
+        ) from err
+
+
+async def section(handler: Callable[[], Awaitable]) -> Section:
+    """Call a handler as a section of the overview
+
+    Errors are returned as the section result instead of being raised, a
+    failing section does not fail the other ones.
+
+    :param handler: Handler of the equivalent route
+    :type handler: Callable
+    :return: Return the section status code, content and duration
+    :rtype: Section
+    """
+    started: float = perf_counter()
+    result: Dict = {"status_code": status.HTTP_200_OK}
+    try:
+        result["content"] = await handler()
+    except HTTPException as err:
+        result["status_code"] = err.status_code
+        result["content"] = {"detail": err.detail}
+    result["elapsed"] = round(perf_counter() - started, 3)
+    return result
+
+
+async def overview() -> Overview:
+    """Retrieve the system information, sleep mode, connectivity and skill
+    list of the device concurrently
+
+    The sections share a single requirements check, the concurrent checks
+    wait for the same retrieval of the skill list which is itself shared
+    with the skill list section.
+
+    :return: Return the result of each section and the total duration
+    :rtype: Overview
+    """
+    started: float = perf_counter()
+    sections: Dict[str, Callable[[], Awaitable]] = {
+        "info": get_info,
+        "sleep": is_awake,
+        "internet": network.internet,
+        "websocket": network.websocket,
+        "skills": skills.retrieve_list,
+    }
+    results: List[Any] = await asyncio.gather(
+        *[section(handler) for handler in sections.values()]
+    )
+    return {
+        **dict(zip(sections, results)),
+        "elapsed": round(perf_counter() - started, 3),
+    }
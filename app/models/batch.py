@@ -0,0 +1,36 @@
+"""Models related to batch
+"""
+
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel
+
+
+class Operation(BaseModel):
+    """Model for batch operation"""
+
+    id: Optional[str] = None
+    operation: str
+    params: Dict[str, Any] = {}
+
+
+class Batch(BaseModel):
+    """Model for batch of operations"""
+
+    operations: List[Operation]
+    ordered: bool = False
+    sort: bool = False
+
+
+class OperationResult(BaseModel):
+    """Model for batch operation output"""
+
+    id: Optional[str] = None
+    operation: str
+    status_code: int
+    content: Any = None
+
+
+class BatchResults(BaseModel):
+    """Model for batch output"""
+
+    results: List[OperationResult]
@@ -0,0 +1,18 @@
+"""Models related to devices
+"""
+
+from typing import List
+from pydantic import BaseModel
+
+
+class Device(BaseModel):
+    """Model for device"""
+
+    name: str
+    connected: bool
+
+
+class Devices(BaseModel):
+    """Model for devices list"""
+
+    devices: List[Device]
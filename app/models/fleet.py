@@ -0,0 +1,19 @@
+"""Models related to fleet
+"""
+
+from typing import Any, Dict
+from pydantic import BaseModel
+
+
+class DeviceResult(BaseModel):
+    """Model for the result of a device"""
+
+    status_code: int
+    elapsed: float
+    content: Any = None
+
+
+class FleetResults(BaseModel):
+    """Model for fleet output"""
+
+    results: Dict[str, DeviceResult]
@@ -21,6 +21,12 @@ class Skills(BaseModel):
     results: Dict[AnyStr, Skill]
 
 
+class Resync(BaseModel):
+    """Model for skill registry synchronization"""
+
+    count: int
+
+
 class Setting(BaseModel):
     """Model for setting option"""
 
@@ -1,7 +1,7 @@
 """Models related to system
 """
 
-from typing import Any
+from typing import Any, Optional
 from pydantic import BaseModel
 
 
@@ -49,3 +49,158 @@ class ConfigResults(BaseModel):
     """Model configuration output"""
 
     results: Config
+
+
+class Section(BaseModel):
+    """Model for a section of the overview"""
+
+    status_code: int
+    elapsed: float
+    content: Any = None
+
+
+class Overview(BaseModel):
+    """Model for overview output"""
+
+    info: Section
+    sleep: Section
+    internet: Section
+    websocket: Section
+    skills: Section
+    elapsed: float
+
+
+class BusStats(BaseModel):
+    """Model for bus connection counters"""
+
+    connected: bool
+    connects: int
+    reconnects: int
+    failures: int
+    sent: int
+    received: int
+    matched: int
+    ignored: int
+    timeouts: int
+    ambiguous: int
+    pending: int
+    leaders: int
+    coalesced: int
+
+
+class CommandsStats(BaseModel):
+    """Model for command queue counters"""
+
+    size: int
+    reserved: int
+    depth: int
+    queued: int
+    sent: int
+    failed: int
+    rejected: int
+    drain_time: float
+    drain_time_max: float
+
+
+class LanesStats(BaseModel):
+    """Model for HTTP lanes counters"""
+
+    concurrency: int
+    running: int
+    waiting: int
+    control: int
+    rejected: int
+
+
+class RequirementsStats(BaseModel):
+    """Model for skill-rest-api presence cache counters"""
+
+    status: Optional[bool]
+    hits: int
+    misses: int
+    refreshes: int
+    invalidations: int
+
+
+class RegistryStats(BaseModel):
+    """Model for skill registry counters"""
+
+    synced: bool
+    count: int
+    resyncs: int
+    updates: int
+
+
+class TokensStats(BaseModel):
+    """Model for verified token cache counters"""
+
+    size: int
+    hits: int
+    misses: int
+
+
+class PasswordsStats(BaseModel):
+    """Model for password verification pool counters"""
+
+    workers: int
+    queue_size: int
+    pending: int
+    verified: int
+    rejected: int
+    wait_time: float
+    wait_time_max: float
+    hash_time: float
+    hash_time_max: float
+
+
+class ResponsesStats(BaseModel):
+    """Model for response cache counters"""
+
+    size: int
+    hits: int
+    misses: int
+    shared: int
+    not_modified: int
+    invalidations: int
+
+
+class EventsStats(BaseModel):
+    """Model for bus event streaming counters"""
+
+    clients: int
+    published: int
+    dropped: int
+    rejected: int
+
+
+class MetricsStats(BaseModel):
+    """Model for metrics recorder counters"""
+
+    pending: int
+    dropped: int
+
+
+class TracingStats(BaseModel):
+    """Model for tracing counters"""
+
+    enabled: bool
+    pending: int
+    exported: int
+    dropped: int
+    failures: int
+
+
+class Stats(BaseModel):
+    """Model for statistics output"""
+
+    bus: BusStats
+    commands: CommandsStats
+    lanes: LanesStats
+    requirements: RequirementsStats
+    responses: ResponsesStats
+    registry: RegistryStats
+    tokens: TokensStats
+    passwords: PasswordsStats
+    events: EventsStats
+    metrics: MetricsStats
+    tracing: TracingStats
@@ -2,10 +2,10 @@
 """
 
 from fastapi import APIRouter, status, Security
-from fastapi.responses import JSONResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from app.models.auth import Tokens, User, AccessToken
 from app.config import get_settings
+from app.common.responses import ORJSONResponse
 from app.handlers import auth
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -22,8 +22,8 @@ settings = get_settings()
     "based on user password authentication",
     response_description="Tokens created",
 )
-async def tokens(info: auth.User) -> JSONResponse:
-    return JSONResponse(content=auth.tokens(info))
+async def tokens(info: auth.User) -> ORJSONResponse:
+    return ORJSONResponse(content=await auth.tokens(info))
 
 
 @router.get(
@@ -36,5 +36,5 @@ async def tokens(info: auth.User) -> JSONResponse:
 )
 async def refresh(
     credentials: HTTPAuthorizationCredentials = Security(HTTPBearer()),
-) -> JSONResponse:
-    return JSONResponse(content=auth.refresh(credentials.credentials))
+) -> ORJSONResponse:
+    return ORJSONResponse(content=await auth.refresh(credentials.credentials))
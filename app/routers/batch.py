@@ -0,0 +1,55 @@
+"""Batch routes
+"""
+
+from fastapi import APIRouter, Body, Depends
+from app.models.batch import Batch, BatchResults
+from app.config import get_settings
+from app.common.responses import ORJSONResponse, response_class
+from app.auth.bearer import JWTBearer
+from app.handlers import batch
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+
+settings = get_settings()
+
+
+@router.post(
+    "",
+    response_model=BatchResults,
+    summary="Execute multiple operations",
+    description="Execute a list of operations within a single request, the \
+        operations are executed concurrently unless `ordered` is set. Each \
+        operation returns its own status code and content, `sort` sorts \
+        alphabetically the keys of the results.",
+    response_description="Operations executed",
+    dependencies=[Depends(JWTBearer())],
+)
+@router.post(
+    "/",
+    response_model=BatchResults,
+    dependencies=[Depends(JWTBearer())],
+    include_in_schema=False,
+)
+async def run(
+    operations: Batch = Body(
+        description="Operations to execute",
+        examples=[
+            {
+                "operations": [
+                    {"id": "stop", "operation": "voice.stop"},
+                    {"id": "mute", "operation": "voice.mute"},
+                    {"id": "awake", "operation": "system.is_awake"},
+                ],
+                "ordered": False,
+            }
+        ],
+    )
+) -> ORJSONResponse:
+    """Execute multiple operations
+
+    :param operations: Operations to execute
+    :type operations: Batch
+    :return: Return the result of each operation
+    :rtype: ORJSONResponse
+    """
+    return response_class(operations.sort)(content=await batch.run(operations))
@@ -0,0 +1,72 @@
+"""Bus routes
+"""
+
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, WebSocket
+from fastapi.responses import StreamingResponse
+from app.config import get_settings
+from app.auth.bearer import JWTBearer
+from app.handlers import bus
+
+router = APIRouter(prefix="/bus", tags=["bus"])
+
+settings = get_settings()
+
+
+@router.get(
+    "/events",
+    summary="Stream the bus messages",
+    description="Stream the messages seen on the bus as Server-Sent Events, \
+        each event carries a message encoded as JSON. All the clients share \
+        the same bus connection.",
+    response_description="Stream of bus messages",
+    response_class=StreamingResponse,
+    dependencies=[Depends(JWTBearer())],
+)
+async def events(
+    types: Optional[str] = Query(
+        default=None,
+        description="Comma separated list of message types to stream, \
+            wildcards are supported such as `recognizer_loop:*`",
+        example="speak,recognizer_loop:*",
+    )
+) -> StreamingResponse:
+    """Stream the bus messages
+
+    :param types: Message types to stream, all the messages if not set
+    :type types: str, optional
+    :return: Return the event stream
+    :rtype: StreamingResponse
+    """
+    return StreamingResponse(
+        await bus.events(types),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def proxy(
+    websocket: WebSocket,
+    token: Optional[str] = Query(
+        default=None,
+        description="Access token, the `Authorization` header could be used \
+            instead",
+    ),
+    types: Optional[str] = Query(
+        default=None,
+        description="Comma separated list of message types to receive, \
+            wildcards are supported such as `recognizer_loop:*`",
+    ),
+) -> None:
+    """Relay the bus messages to the client and the allowed client messages
+    to the bus, all the clients share the same bus connection.
+
+    :param websocket: Client websocket
+    :type websocket: WebSocket
+    :param token: Access token
+    :type token: str, optional
+    :param types: Message types to receive, all the messages if not set
+    :type types: str, optional
+    """
+    await bus.proxy(websocket, token, types)
@@ -0,0 +1,33 @@
+"""Devices routes
+"""
+
+from fastapi import APIRouter, Depends, status
+from app.models.devices import Devices
+from app.config import get_settings
+from app.common.responses import ORJSONResponse
+from app.auth.bearer import JWTBearer
+from app.handlers import devices
+
+router = APIRouter(prefix="/devices", tags=["devices"])
+
+settings = get_settings()
+
+
+@router.get(
+    "",
+    response_model=Devices,
+    status_code=status.HTTP_200_OK,
+    summary="List the devices",
+    description="List the OVOS devices managed by the API, the routes of a \
+        device are available under `/v1/devices/{device}` or with the \
+        `X-OVOS-Device` header",
+    response_description="Devices list",
+    dependencies=[Depends(JWTBearer())],
+)
+async def retrieve_list() -> ORJSONResponse:
+    """List the devices
+
+    :return: Return the devices and their bus connection status
+    :rtype: ORJSONResponse
+    """
+    return ORJSONResponse(content=await devices.retrieve_list())
@@ -0,0 +1,88 @@
+"""Fleet routes
+"""
+
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, status
+from app.models.fleet import FleetResults
+from app.config import get_settings
+from app.common.responses import ORJSONResponse
+from app.auth.bearer import JWTBearer
+from app.handlers import fleet
+
+router = APIRouter(prefix="/fleet", tags=["fleet"])
+
+settings = get_settings()
+
+DEVICES_QUERY: str = "Comma separated list of devices, every device if not set"
+
+
+@router.get(
+    "/system/info",
+    response_model=FleetResults,
+    status_code=status.HTTP_200_OK,
+    summary="Collect information from every device",
+    description="Send `ovos.api.info` message to the bus of every device \
+        concurrently. Each device has `FLEET_TIMEOUT` seconds to answer and \
+        returns its own status code, content and duration.",
+    response_description="Retrieved information",
+    dependencies=[Depends(JWTBearer())],
+)
+async def info(
+    devices: Optional[str] = Query(default=None, description=DEVICES_QUERY)
+) -> ORJSONResponse:
+    """Collect information from every device
+
+    :param devices: Comma separated list of devices
+    :type devices: str, optional
+    :return: Return the information of each device
+    :rtype: ORJSONResponse
+    """
+    return ORJSONResponse(content=await fleet.get_info(devices))
+
+
+@router.get(
+    "/system/sleep",
+    response_model=FleetResults,
+    status_code=status.HTTP_200_OK,
+    summary="Retrieve the sleep mode status of every device",
+    description="Send `ovos.api.is_awake` message to the bus of every \
+        device concurrently. Each device has `FLEET_TIMEOUT` seconds to \
+        answer and returns its own status code, content and duration.",
+    response_description="Sleep mode status retrieved",
+    dependencies=[Depends(JWTBearer())],
+)
+async def is_awake(
+    devices: Optional[str] = Query(default=None, description=DEVICES_QUERY)
+) -> ORJSONResponse:
+    """Retrieve the sleep mode status of every device
+
+    :param devices: Comma separated list of devices
+    :type devices: str, optional
+    :return: Return the sleep mode status of each device
+    :rtype: ORJSONResponse
+    """
+    return ORJSONResponse(content=await fleet.is_awake(devices))
+
+
+@router.get(
+    "/network/internet",
+    response_model=FleetResults,
+    status_code=status.HTTP_200_OK,
+    summary="Get the Internet connection status of every device",
+    description="Check for internet connectivity of every device \
+        concurrently. Each device has `FLEET_TIMEOUT` seconds to answer and \
+        returns its own status code, content and duration.",
+    response_description="Connectivity status",
+    dependencies=[Depends(JWTBearer())],
+)
+async def internet(
+    devices: Optional[str] = Query(default=None, description=DEVICES_QUERY)
+) -> ORJSONResponse:
+    """Get the Internet connection status of every device
+
+    :param devices: Comma separated list of devices
+    :type devices: str, optional
+    :return: Return the connectivity status of each device
+    :rtype: ORJSONResponse
+    """
+    return ORJSONResponse(content=await fleet.internet(devices))
@@ -0,0 +1,31 @@
+"""Metrics routes
+"""
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import Response
+from prometheus_client import CONTENT_TYPE_LATEST
+from app.auth.bearer import MetricsBearer
+from app.config import get_settings
+from app.handlers import metrics
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+settings = get_settings()
+
+
+@router.get(
+    "",
+    summary="Export the Prometheus metrics",
+    description="Export the HTTP, bus, authentication and streaming metrics \
+        in the Prometheus text format",
+    response_description="Metrics exposition",
+    response_class=Response,
+    dependencies=[Depends(MetricsBearer())],
+)
+async def collect() -> Response:
+    """Export the Prometheus metrics
+
+    :return: Return the metrics exposition
+    :rtype: Response
+    """
+    return Response(content=await metrics.collect(), media_type=CONTENT_TYPE_LATEST)
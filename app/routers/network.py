@@ -2,9 +2,9 @@
 """
 
 from fastapi import APIRouter, Depends, status
-from fastapi.responses import JSONResponse
 from app.models.network import Pong, Internet, Websocket
 from app.config import get_settings
+from app.common.responses import ORJSONResponse
 from app.auth.bearer import JWTBearer
 from app.handlers import network
 
@@ -21,13 +21,13 @@ settings = get_settings()
     description="Send a request to monitor the API",
     response_description="API status",
 )
-async def ping() -> JSONResponse:
+async def ping() -> ORJSONResponse:
     """Get the API status
 
     :return: Return famous ping pong players
-    :rtype: JSONResponse
+    :rtype: ORJSONResponse
     """
-    return JSONResponse(content=network.ping())
+    return ORJSONResponse(content=await network.ping())
 
 
 @router.get(
@@ -39,13 +39,13 @@ async def ping() -> JSONResponse:
     response_description="Connectivity status",
     dependencies=[Depends(JWTBearer())],
 )
-async def internet() -> JSONResponse:
+async def internet() -> ORJSONResponse:
     """Get Internet connection status
 
     :return: Return Internet connectivity status as boolean
-    :rtype: JSONResponse
+    :rtype: ORJSONResponse
     """
-    return JSONResponse(content=network.internet())
+    return ORJSONResponse(content=await network.internet())
 
 
 @router.get(
@@ -57,10 +57,10 @@ async def internet() -> JSONResponse:
     response_description="Connectivity status",
     dependencies=[Depends(JWTBearer())],
 )
-async def websocket() -> JSONResponse:
+async def websocket() -> ORJSONResponse:
     """Get websocket connection status
 
     :return: Return websocket connectivity status as boolean
-    :rtype: JSONResponse
+    :rtype: ORJSONResponse
     """
-    return JSONResponse(content=network.websocket())
+    return ORJSONResponse(content=await network.websocket())
@@ -2,11 +2,13 @@
 """
 
 from typing import Optional
-from fastapi import APIRouter, Depends, status, Query, Path, Body
-from fastapi.responses import JSONResponse, Response
-from app.models.skills import Skills, Settings, Install, Uninstall
+from fastapi import APIRouter, Depends, Request, status, Query, Path, Body
+from fastapi.responses import Response
+from app.models.skills import Skills, Settings, Install, Uninstall, Resync
 from app.config import get_settings
+from app.common.responses import ORJSONResponse
 from app.auth.bearer import JWTBearer
+from app.common.devices import current
 from app.handlers import skills
 
 router = APIRouter(prefix="/skills", tags=["skills"])
@@ -44,6 +46,25 @@ settings = get_settings()
 #     return JSONResponse(content=skills.retrieve_list(sort))
 
 
+@router.put(
+    "/resync",
+    response_model=Resync,
+    summary="Synchronize the skill registry",
+    description="Send `skillmanager.list` message to the bus and wait \
+        for `mycroft.skills.list` response to rebuild the skill registry \
+        used to look up skills by ID",
+    response_description="Skill registry synchronized",
+    dependencies=[Depends(JWTBearer())],
+)
+async def resync() -> ORJSONResponse:
+    """Route to force the skill registry synchronization
+
+    :return: Return the number of skills registered
+    :rtype: ORJSONResponse
+    """
+    return ORJSONResponse(content=await skills.resync())
+
+
 @router.get(
     "/{skill_id}/settings",
     response_model=Settings,
@@ -55,19 +76,30 @@ settings = get_settings()
     dependencies=[Depends(JWTBearer())],
 )
 async def retrieve_settings(
+    request: Request,
     skill_id: str = Path(
         description="Skill to retrieve settings",
         example="skill-ovos-hello-world.openvoiceos",
-    )
-) -> JSONResponse:
+    ),
+) -> ORJSONResponse:
     """Route to retrieve skill settingss
 
+    The response is cached and carries an `ETag`, a request with a matching
+    `If-None-Match` header gets a HTTP 304.
+
+    :param request: Incoming request
+    :type request: Request
     :param skill_id: Skill ID to retrieve the settings
     :type skill_id: str
     :return: Return the skill settings
-    :rtype: JSONResponse
+    :rtype: ORJSONResponse
     """
-    return JSONResponse(content=skills.retrieve_settings(skill_id))
+    return await current().responses.respond(
+        request,
+        ("skills.settings", skill_id),
+        settings.cache_ttl_skill_settings,
+        lambda: skills.retrieve_settings(skill_id),
+    )
 
 
 @router.put(
@@ -90,7 +122,7 @@ async def deactivate(
     :return: HTTP status code
     :rtype: int
     """
-    return Response(status_code=skills.deactivate(skill_id))
+    return Response(status_code=await skills.deactivate(skill_id))
 
 
 @router.put(
@@ -114,7 +146,7 @@ async def activate(
     :return: HTTP status code
     :rtype: int
     """
-    return Response(status_code=skills.activate(skill_id))
+    return Response(status_code=await skills.activate(skill_id))
 
 
 # @router.put(
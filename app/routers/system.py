@@ -2,13 +2,15 @@
 """
 
 from typing import Optional
-from fastapi.responses import JSONResponse, Response
-from fastapi import APIRouter, Depends, status, Query, Body
+from fastapi.responses import Response
+from fastapi import APIRouter, Depends, Request, status, Query, Body
 
-from app.models.system import InfoResults, Cache, ConfigResults
+from app.models.system import InfoResults, Cache, ConfigResults, Overview, Stats
 from app.models.voice import Speak
 from app.config import get_settings
+from app.common.responses import ORJSONResponse
 from app.auth.bearer import JWTBearer
+from app.common.devices import current
 from app.handlers import system
 
 
@@ -28,18 +30,30 @@ settings = get_settings()
     dependencies=[Depends(JWTBearer())],
 )
 async def info(
+    request: Request,
     sort: Optional[bool] = Query(
         default=False, description="Sort alphabetically the settings"
-    )
-) -> JSONResponse:
+    ),
+) -> ORJSONResponse:
     """Collect information
 
+    The response is cached and carries an `ETag`, a request with a matching
+    `If-None-Match` header gets a HTTP 304.
+
+    :param request: Incoming request
+    :type request: Request
     :param sort: Sort alphabetically the information
     :type sort: bool, optional
     :return: Return the information
-    :rtype: JSONResponse
+    :rtype: ORJSONResponse
     """
-    return JSONResponse(content=system.get_info(sort))
+    return await current().responses.respond(
+        request,
+        ("system.info", sort),
+        settings.cache_ttl_info,
+        system.get_info,
+        sort,
+    )
 
 
 @router.get(
@@ -53,18 +67,30 @@ async def info(
     dependencies=[Depends(JWTBearer())],
 )
 async def config(
+    request: Request,
     sort: Optional[bool] = Query(
         default=False, description="Sort alphabetically the settings"
-    )
-) -> JSONResponse:
+    ),
+) -> ORJSONResponse:
     """Collect local or core configuration
 
+    The response is cached and carries an `ETag`, a request with a matching
+    `If-None-Match` header gets a HTTP 304.
+
+    :param request: Incoming request
+    :type request: Request
     :param sort: Sort alphabetically the configuration
     :type sort: bool, optional
     :return: Return the configuration
-    :rtype: JSONResponse
+    :rtype: ORJSONResponse
     """
-    return JSONResponse(content=system.get_config(sort))
+    return await current().responses.respond(
+        request,
+        ("system.config", sort),
+        settings.cache_ttl_config,
+        system.get_config,
+        sort,
+    )
 
 
 @router.post(
@@ -94,10 +120,10 @@ async def sleep(
     :param dialog: Confirmation message to play
     :type dialog: dict, optional
     :return: Return payload sent
-    :rtype: JSONResponse
+    :rtype: ORJSONResponse
     """
-    return JSONResponse(
-        status_code=status.HTTP_201_CREATED, content=system.sleep(confirm, dialog)
+    return ORJSONResponse(
+        status_code=status.HTTP_201_CREATED, content=await system.sleep(confirm, dialog)
     )
 
 
@@ -128,10 +154,11 @@ async def wake_up(
     :param dialog: Confirmation message to play
     :type dialog: dict, optional
     :return: Return payload sent
-    :rtype: JSONResponse
+    :rtype: ORJSONResponse
     """
-    return JSONResponse(
-        status_code=status.HTTP_201_CREATED, content=system.wake_up(confirm, dialog)
+    return ORJSONResponse(
+        status_code=status.HTTP_201_CREATED,
+        content=await system.wake_up(confirm, dialog),
     )
 
 
@@ -144,13 +171,34 @@ async def wake_up(
     response_description="Retrieved sleep state",
     dependencies=[Depends(JWTBearer())],
 )
-async def is_awake() -> JSONResponse:
+async def is_awake() -> ORJSONResponse:
     """Get sleep mode state
 
     :return: Return sleep state
-    :rtype: JSONResponse
+    :rtype: ORJSONResponse
     """
-    return JSONResponse(content=system.is_awake())
+    return ORJSONResponse(content=await system.is_awake())
+
+
+@router.get(
+    "/overview",
+    response_model=Overview,
+    summary="Get an overview of the device",
+    description="Retrieve concurrently the system information, the sleep \
+        mode state, the Internet and websocket connectivity and the skill \
+        list. Each section carries its own status code and duration, a \
+        failing section does not fail the others. This route leverage the \
+        `skill-rest-api`.",
+    response_description="Retrieved overview",
+    dependencies=[Depends(JWTBearer())],
+)
+async def overview() -> ORJSONResponse:
+    """Get an overview of the device
+
+    :return: Return the result of each section
+    :rtype: ORJSONResponse
+    """
+    return ORJSONResponse(content=await system.overview())
 
 
 @router.delete(
@@ -176,8 +224,26 @@ async def caching(
     :param cache_type: Type of cache to clear
     :type cache_type: dict
     :return: Return cache type deleted
-    :rtype: JSONResponse
+    :rtype: ORJSONResponse
     """
-    return JSONResponse(
-        status_code=status.HTTP_201_CREATED, content=system.caching(cache_type)
+    return ORJSONResponse(
+        status_code=status.HTTP_201_CREATED, content=await system.caching(cache_type)
     )
+
+
+@router.get(
+    "/stats",
+    response_model=Stats,
+    summary="Get API statistics",
+    description="Retrieve the internal counters of the API such as the \
+        number of connections opened to the bus.",
+    response_description="Retrieved statistics",
+    dependencies=[Depends(JWTBearer())],
+)
+async def stats() -> ORJSONResponse:
+    """Get API statistics
+
+    :return: Return the statistics
+    :rtype: ORJSONResponse
+    """
+    return ORJSONResponse(content=await system.stats())
@@ -2,9 +2,10 @@
 """
 
 from fastapi import APIRouter, Depends, status, Body
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import Response
 from app.models.voice import Speak
 from app.config import get_settings
+from app.common.responses import ORJSONResponse
 from app.auth.bearer import JWTBearer
 from app.handlers import voice
 
@@ -16,10 +17,10 @@ settings = get_settings()
 @router.post(
     "/speech",
     response_model=Speak,
-    status_code=status.HTTP_201_CREATED,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Request to speak an utterance",
-    description="Send `speak` message to the bus with the utterance to speak",
-    response_description="Utterance spoken",
+    description="Queue `speak` message for the bus with the utterance to speak",
+    response_description="Utterance queued",
     dependencies=[Depends(JWTBearer())],
 )
 async def speaking(
@@ -28,81 +29,83 @@ async def speaking(
         description="Message to play",
         example='{"utterance": "open voice o.s. for the win baby!", "lang": "en-us"}',
     )
-) -> JSONResponse:
+) -> ORJSONResponse:
     """Request to speak an utterance
 
     :param dialog: Message to play
     :type dialog: dict
     :return: Return message played
-    :rtype: JSONResponse
+    :rtype: ORJSONResponse
     """
-    return JSONResponse(content=voice.speaking(dialog))
+    return ORJSONResponse(
+        content=await voice.speaking(dialog), status_code=status.HTTP_202_ACCEPTED
+    )
 
 
 @router.delete(
     "/speech",
-    status_code=status.HTTP_204_NO_CONTENT,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Request the speech to stop",
-    description="Send `mycroft.stop` message to the bus to stop any speech",
-    response_description="Speech stopped",
+    description="Queue `mycroft.stop` message for the bus to stop any speech",
+    response_description="Stop queued",
     dependencies=[Depends(JWTBearer())],
 )
-async def stop() -> JSONResponse:
+async def stop() -> ORJSONResponse:
     """Request to stop the speech
 
     :return: HTTP status code
     :rtype: int
     """
-    return Response(status_code=voice.stop())
+    return Response(status_code=await voice.stop())
 
 
 @router.put(
     "/microphone/mute",
-    status_code=status.HTTP_204_NO_CONTENT,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Request to mute the microhpone",
-    description="Send `mycroft.mic.mute` message to the bus to mute the microhpone",
-    response_description="Microphone muted",
+    description="Queue `mycroft.mic.mute` message for the bus to mute the microhpone",
+    response_description="Mute queued",
     dependencies=[Depends(JWTBearer())],
 )
-async def mute() -> JSONResponse:
+async def mute() -> ORJSONResponse:
     """Request to mute the microphone
 
     :return: HTTP status code
     :rtype: int
     """
-    return Response(status_code=voice.mute())
+    return Response(status_code=await voice.mute())
 
 
 @router.put(
     "/microphone/unmute",
-    status_code=status.HTTP_204_NO_CONTENT,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Request to unmute the microhpone",
-    description="Send `mycroft.mic.unmute` message to the bus to unmute"
+    description="Queue `mycroft.mic.unmute` message for the bus to unmute"
     "the microhpone",
-    response_description="Microphone unmuted",
+    response_description="Unmute queued",
     dependencies=[Depends(JWTBearer())],
 )
-async def unmute() -> JSONResponse:
+async def unmute() -> ORJSONResponse:
     """Request to unmute the microphone
 
     :return: HTTP status code
     :rtype: int
     """
-    return Response(status_code=voice.unmute())
+    return Response(status_code=await voice.unmute())
 
 
 @router.put(
     "/listen",
-    status_code=status.HTTP_204_NO_CONTENT,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Request to start recording",
-    description="Send `mycroft.mic.listen` message to the bus to start the recording",
-    response_description="Microphone listened",
+    description="Queue `mycroft.mic.listen` message for the bus to start the recording",
+    response_description="Recording queued",
     dependencies=[Depends(JWTBearer())],
 )
-async def listen() -> JSONResponse:
+async def listen() -> ORJSONResponse:
     """Request to start the recording
 
     :return: HTTP status code
     :rtype: int
     """
-    return Response(status_code=voice.listen())
+    return Response(status_code=await voice.listen())
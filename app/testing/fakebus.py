@@ -0,0 +1,364 @@
+"""Stand-in for the OVOS message bus answering the messages the API waits for
+
+Every message received is broadcasted to all the clients like the real bus
+does, the messages sent by the handlers are answered the way `ovos-core`
+and `skill-rest-api` would. Latency, background chatter, dropped answers
+and refused authentications are configurable and driven by a seeded random
+generator to reproduce a scenario.
+
+    python -m app.testing.fakebus --port 8181 --latency 0.05 --chatter 1000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import signal
+import sys
+from base64 import b64encode
+from http import HTTPStatus
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from websockets.asyncio.server import ServerConnection, broadcast, serve
+from websockets.http11 import Request, Response
+
+INFO: Dict = {
+    "name": "fakebus",
+    "core_version": "0.0.8",
+    "tts_engine": "ovos-tts-plugin-piper",
+    "locales": {
+        "city": "Montréal",
+        "country": "Canada",
+        "timezone": "America/Montreal",
+        "lang": "en-us",
+    },
+    "log_level": "INFO",
+    "system": {"architecture": "aarch64", "os": "Linux", "kernel": "6.6.31"},
+}
+
+CONFIG: Dict = {
+    "lang": "en-us",
+    "secondary_langs": [],
+    "system_unit": "metric",
+    "time_format": "half",
+    "date_format": "MDY",
+    "location": {
+        "city": {
+            "code": "Montreal",
+            "name": "Montréal",
+            "state": {
+                "code": "QC",
+                "name": "Quebec",
+                "country": {"code": "CA", "name": "Canada"},
+            },
+        },
+        "coordinate": {"latitude": 45.5088, "longitude": -73.5878},
+        "timezone": {"code": "America/Montreal", "name": "Eastern Time"},
+    },
+    "listener": {
+        "sample_rate": 16000,
+        "record_wake_words": False,
+        "save_utterances": False,
+        "wake_word_upload": {"disable": True},
+        "VAD": {"silence_method": "vad_and_ratio", "module": "ovos-vad-plugin-silero"},
+    },
+    "hotwords": {
+        "hey_mycroft": {
+            "module": "ovos-ww-plugin-precise-lite",
+            "model": "https://github.com/OpenVoiceOS/precise-lite-models/raw/master/wakewords/en/hey_mycroft.tflite",
+            "expected_duration": 3,
+            "trigger_level": 3,
+            "sensitivity": 0.5,
+            "listen": True,
+        }
+    },
+    "tts": {"module": "ovos-tts-plugin-piper", "ovos-tts-plugin-piper": {}},
+    "stt": {"module": "ovos-stt-plugin-server", "ovos-stt-plugin-server": {}},
+    "websocket": {"host": "127.0.0.1", "port": 8181, "route": "/core"},
+    "skills": {"blacklisted_skills": [], "priority_skills": []},
+}
+
+CHATTER: List[Tuple[str, Dict]] = [
+    ("enclosure.mouth.viseme_list", {"start": 0.0, "visemes": [[0, 0.1]]}),
+    ("mycroft.audio.service.track_info", {"title": "", "artist": ""}),
+    ("gui.status.request", {}),
+    ("mycroft.skill.handler.start", {"name": "TimeSkill.handle_query_time"}),
+    ("ovos.common_play.player.state", {"state": 1}),
+]
+
+
+class FakeBus:
+    """Fake message bus serving the `/core` route.
+
+    :param latency: Seconds before an answer is sent
+    :type latency: float
+    :param jitter: Random seconds added to the latency, up to this value
+    :type jitter: float
+    :param chatter: Unrelated messages broadcasted per second
+    :type chatter: int
+    :param drop_rate: Probability of an answer not being sent
+    :type drop_rate: float
+    :param authenticated: Answer `skill-rest-api` messages as authenticated
+    :type authenticated: bool
+    :param api_key: Only authenticate the messages carrying this API key
+    :type api_key: str, optional
+    :param skills: Number of skills installed besides `skill-rest-api`
+    :type skills: int
+    :param seed: Seed of the random generator
+    :type seed: int
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        chatter: int = 0,
+        drop_rate: float = 0.0,
+        authenticated: bool = True,
+        api_key: Optional[str] = None,
+        skills: int = 10,
+        seed: int = 0,
+    ):
+        self.latency: float = latency
+        self.jitter: float = jitter
+        self.chatter: int = chatter
+        self.drop_rate: float = drop_rate
+        self.authenticated: bool = authenticated
+        self.app_key: Optional[str] = (
+            b64encode(api_key.encode("utf-8")).decode("utf-8") if api_key else None
+        )
+        self.received: int = 0
+        self.answered: int = 0
+        self.dropped: int = 0
+        self.chattered: int = 0
+        self.clients: Set[ServerConnection] = set()
+        self._random: random.Random = random.Random(seed)
+        self._skills: Dict[str, Dict] = {
+            skill_id: {"id": skill_id, "active": True}
+            for skill_id in ["skill-rest-api.smartgic"]
+            + [f"skill-fake-{index}.openvoiceos" for index in range(skills)]
+        }
+        self._answers: Dict[str, Tuple[str, Callable[[Dict], Dict]]] = {
+            "skillmanager.list": ("mycroft.skills.list", lambda data: self._skills),
+            "ovos.api.info": ("ovos.api.info.answer", lambda data: INFO),
+            "ovos.api.config": ("ovos.api.config.answer", lambda data: CONFIG),
+            "ovos.api.skill_settings": (
+                "ovos.api.skill_settings.answer",
+                lambda data: {
+                    "__mycroft_skill_firstrun": False,
+                    "skill": data["skill"],
+                },
+            ),
+            "recognizer_loop:sleep": (
+                "ovos.api.sleep.answer",
+                lambda data: {"sleep": True},
+            ),
+            "recognizer_loop:wake_up": (
+                "ovos.api.wake_up.answer",
+                lambda data: {"sleep": False},
+            ),
+            "ovos.api.is_awake": (
+                "ovos.api.is_awake.answer",
+                lambda data: {"is_awake": True},
+            ),
+            "ovos.api.cache": (
+                "ovos.api.cache.answer",
+                lambda data: {"cache_type": data["cache_type"]},
+            ),
+            "ovos.api.internet": (
+                "ovos.api.internet.answer",
+                lambda data: {"status": True},
+            ),
+            "ovos.api.websocket": (
+                "ovos.api.websocket.answer",
+                lambda data: {"listening": True},
+            ),
+        }
+
+    def answer(self, message: Dict) -> Optional[Dict]:
+        """Build the answer of a message
+
+        The context of the message is carried back, the messages handled
+        by `skill-rest-api` get the `authenticated` flag.
+
+        :param message: Message received from a client
+        :type message: dict
+        :return: Return the answer or None if the message has no answer
+        :rtype: dict, optional
+        """
+        message_type: str = message.get("type", "")
+        if message_type not in self._answers:
+            return None
+        answer_type, build = self._answers[message_type]
+        data: Dict = message.get("data") or {}
+        context: Dict = dict(message.get("context") or {})
+        if message_type == "skillmanager.list":
+            return {"type": answer_type, "data": build(data), "context": context}
+        context["authenticated"] = self.authenticated and (
+            self.app_key is None or data.get("app_key") == self.app_key
+        )
+        return {
+            "type": answer_type,
+            "data": build(data) if context["authenticated"] else {},
+            "context": context,
+        }
+
+    def stats(self) -> Dict:
+        """Bus counters
+
+        :return: Return the number of clients and the counters
+        :rtype: dict
+        """
+        return {
+            "clients": len(self.clients),
+            "received": self.received,
+            "answered": self.answered,
+            "dropped": self.dropped,
+            "chattered": self.chattered,
+        }
+
+    async def serve(self, host: str, port: int) -> None:
+        """Serve the bus until the task is cancelled
+
+        :param host: Address to listen on
+        :type host: str
+        :param port: Port to listen on
+        :type port: int
+        """
+        async with serve(
+            self._handler,
+            host,
+            port,
+            process_request=self._route,
+            max_size=None,
+        ):
+            chatter: Optional[asyncio.Task] = (
+                asyncio.create_task(self._chatter()) if self.chatter else None
+            )
+            try:
+                await asyncio.get_running_loop().create_future()
+            finally:
+                if chatter is not None:
+                    chatter.cancel()
+
+    @staticmethod
+    def _route(connection: ServerConnection, request: Request) -> Optional[Response]:
+        """Reject the connections to another route than `/core`
+
+        :param connection: Incoming connection
+        :type connection: ServerConnection
+        :param request: Handshake request
+        :type request: Request
+        :return: Return a HTTP 404 for the unknown routes
+        :rtype: Response, optional
+        """
+        if request.path != "/core":
+            return connection.respond(HTTPStatus.NOT_FOUND, "not found\n")
+        return None
+
+    async def _handler(self, websocket: ServerConnection) -> None:
+        """Broadcast the messages of a client and schedule their answers
+
+        :param websocket: Client connection
+        :type websocket: ServerConnection
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        self.clients.add(websocket)
+        try:
+            async for raw in websocket:
+                self.received += 1
+                broadcast(self.clients, raw)
+                try:
+                    answer: Optional[Dict] = self.answer(json.loads(raw))
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    continue
+                if answer is None:
+                    continue
+                if self._random.random() < self.drop_rate:
+                    self.dropped += 1
+                    continue
+                delay: float = self.latency + self._random.uniform(0, self.jitter)
+                loop.call_later(delay, self._send, json.dumps(answer))
+        finally:
+            self.clients.discard(websocket)
+
+    def _send(self, raw: str) -> None:
+        """Broadcast an answer
+
+        :param raw: Answer encoded as JSON
+        :type raw: str
+        """
+        self.answered += 1
+        broadcast(self.clients, raw)
+
+    async def _chatter(self) -> None:
+        """Broadcast unrelated messages at the configured rate, the messages
+        are sent by batches every 10 milliseconds.
+        """
+        frames: List[str] = [
+            json.dumps({"type": message_type, "data": data, "context": {}})
+            for message_type, data in CHATTER
+        ]
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        started: float = loop.time()
+        while True:
+            await asyncio.sleep(0.01)
+            due: int = int((loop.time() - started) * self.chatter) - self.chattered
+            for _ in range(due):
+                broadcast(self.clients, self._random.choice(frames))
+            self.chattered += due
+
+
+async def _run(bus: FakeBus, host: str, port: int) -> None:
+    """Serve the bus until SIGINT or SIGTERM is received
+
+    :param bus: Bus to serve
+    :type bus: FakeBus
+    :param host: Address to listen on
+    :type host: str
+    :param port: Port to listen on
+    :type port: int
+    """
+    task: asyncio.Task = asyncio.current_task()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        asyncio.get_running_loop().add_signal_handler(signum, task.cancel)
+    try:
+        await bus.serve(host, port)
+    except asyncio.CancelledError:
+        pass
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the fake bus from the command line
+
+    :param argv: Command line arguments
+    :type argv: list, optional
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8181)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--chatter", type=int, default=0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--unauthenticated", action="store_true")
+    parser.add_argument("--api-key", type=str, default=None)
+    parser.add_argument("--skills", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    bus: FakeBus = FakeBus(
+        latency=args.latency,
+        jitter=args.jitter,
+        chatter=args.chatter,
+        drop_rate=args.drop_rate,
+        authenticated=not args.unauthenticated,
+        api_key=args.api_key,
+        skills=args.skills,
+        seed=args.seed,
+    )
+    asyncio.run(_run(bus, args.host, args.port))
+    print(json.dumps(bus.stats()), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""Measure the authentication overhead of a request
+
+Compare the JWT verification done for every authenticated request when
+users are read from the JSON database on each call (legacy behavior),
+when they are served by the in-memory user store and when the verified
+token is served by the token cache.
+
+    python benchmarks/auth.py --users 1000 --iterations 2000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from timeit import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--users", type=int, default=100)
+parser.add_argument("--iterations", type=int, default=2000)
+args = parser.parse_args()
+
+users_db = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+json.dump(
+    [
+        {"user": f"user{index}", "password": "$2b$12$" + "x" * 53, "active": True}
+        for index in range(args.users)
+    ],
+    users_db,
+)
+users_db.close()
+
+os.environ.setdefault("SECRET", "benchmark")
+os.environ.setdefault("API_KEY", "benchmark")
+os.environ["USERS_DB"] = users_db.name
+
+# pylint: disable=wrong-import-position
+from app.auth import bearer, handlers  # noqa: E402
+from app.auth.bearer import JWTBearer  # noqa: E402
+
+
+def legacy_get_user(user: str) -> dict:
+    """Read and scan the JSON database like the API did before the store"""
+    with open(users_db.name, encoding="utf-8") as data:
+        for entry in json.load(data):
+            if entry["user"] == user and entry["active"]:
+                return entry
+    return False
+
+
+def measure(label: str, func) -> None:
+    """Print the average duration of a function in microseconds"""
+    duration: float = timeit(func, number=args.iterations) / args.iterations
+    print(f"{label:<40} {duration * 1_000_000:>10.1f} us")
+
+
+token: str = handlers.encode_access_jwt(f"user{args.users - 1}")
+user: str = f"user{args.users - 1}"
+
+print(f"{args.users} users, {args.iterations} iterations")
+measure("get_user (legacy)", lambda: legacy_get_user(user))
+measure("get_user (store)", lambda: handlers.get_user(user))
+
+cache_size: int = bearer.token_cache.size
+bearer.token_cache.size = 0
+bearer.get_user = legacy_get_user
+measure("verify_access_jwt (legacy)", lambda: JWTBearer.verify_access_jwt(token))
+bearer.get_user = handlers.get_user
+measure("verify_access_jwt (store)", lambda: JWTBearer.verify_access_jwt(token))
+bearer.token_cache.size = cache_size
+measure("verify_access_jwt (token cache)", lambda: JWTBearer.verify_access_jwt(token))
+
+os.unlink(users_db.name)
@@ -0,0 +1,385 @@
+#!/usr/bin/env python
+"""Measure the throughput and latency of every request/response route
+
+Start the fake message bus and the API with uvicorn, then send the
+requests of each route from concurrent keep-alive connections. The
+latency percentiles, the requests per second and the bus messages per
+request are printed and written as JSON to compare the commits. The
+`noisy` scenario broadcasts thousands of unrelated messages per second to
+stress the loop receiving the bus messages.
+
+    python benchmarks/load.py --requests 1000 --concurrency 16 --output load.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+import bcrypt
+
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOST: str = "127.0.0.1"
+PREFIX: str = "/v1"
+USER: Dict = {"user": "benchmark", "password": "benchmark"}
+SKILL: str = "skill-fake-0.openvoiceos"
+BATCH: Dict = {
+    "operations": [
+        {"operation": "system.get_info"},
+        {"operation": "skills.retrieve_settings", "params": {"skill_id": SKILL}},
+        {"operation": "voice.speaking", "params": {"utterance": "benchmark"}},
+    ]
+}
+
+# Method, path, body and token sent within the Authorization header, the
+# streaming routes and /metrics outside of the version prefix are left out
+ROUTES: List[Tuple[str, str, Optional[Dict], Optional[str]]] = [
+    ("POST", "/auth/tokens", USER, None),
+    ("GET", "/auth/refresh", None, "refresh_token"),
+    ("PUT", "/skills/resync", None, "access_token"),
+    ("GET", f"/skills/{SKILL}/settings", None, "access_token"),
+    ("PUT", f"/skills/{SKILL}/deactivate", None, "access_token"),
+    ("PUT", f"/skills/{SKILL}/activate", None, "access_token"),
+    ("GET", "/system/info", None, "access_token"),
+    ("GET", "/system/config", None, "access_token"),
+    ("POST", "/system/sleep", None, "access_token"),
+    ("POST", "/system/wakeup", None, "access_token"),
+    ("GET", "/system/sleep", None, "access_token"),
+    ("DELETE", "/system/cache", {"cache_type": "tts"}, "access_token"),
+    ("GET", "/system/stats", None, "access_token"),
+    ("GET", "/system/overview", None, "access_token"),
+    ("POST", "/voice/speech", {"utterance": "benchmark"}, "access_token"),
+    ("DELETE", "/voice/speech", None, "access_token"),
+    ("PUT", "/voice/microphone/mute", None, "access_token"),
+    ("PUT", "/voice/microphone/unmute", None, "access_token"),
+    ("PUT", "/voice/listen", None, "access_token"),
+    ("GET", "/network/ping", None, None),
+    ("GET", "/network/internet", None, "access_token"),
+    ("GET", "/network/websocket", None, "access_token"),
+    ("POST", "/batch", BATCH, "access_token"),
+    ("GET", "/devices", None, "access_token"),
+    ("GET", "/fleet/system/info", None, "access_token"),
+    ("GET", "/fleet/system/sleep", None, "access_token"),
+    ("GET", "/fleet/network/internet", None, "access_token"),
+]
+
+SCENARIOS: Dict[str, int] = {"quiet": 0, "noisy": 5000}
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--requests", type=int, default=500)
+parser.add_argument("--concurrency", type=int, default=16)
+parser.add_argument("--warmup", type=int, default=20)
+parser.add_argument("--scenarios", type=str, default="quiet,noisy")
+parser.add_argument("--chatter", type=int, default=SCENARIOS["noisy"])
+parser.add_argument("--latency", type=float, default=0.0)
+parser.add_argument("--routes", type=str, default="")
+parser.add_argument("--no-cache", action="store_true")
+parser.add_argument("--bcrypt-rounds", type=int, default=4)
+parser.add_argument("--output", type=str, default="")
+args = parser.parse_args()
+SCENARIOS["noisy"] = args.chatter
+
+
+class Connection:
+    """HTTP/1.1 keep-alive connection, the responses must carry a
+    `Content-Length` header like the ones sent by uvicorn for JSON.
+    """
+
+    def __init__(self, port: int):
+        self.port: int = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(
+        self, method: str, path: str, body: Optional[Dict], token: Optional[str]
+    ) -> Tuple[int, bytes]:
+        """Send a request and read its response, the connection is opened
+        again after an error.
+        """
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(HOST, self.port)
+        payload: bytes = json.dumps(body).encode() if body is not None else b""
+        head: str = (
+            f"{method} {PREFIX}{path} HTTP/1.1\r\nHost: {HOST}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n"
+        )
+        if token:
+            head += f"Authorization: Bearer {token}\r\n"
+        try:
+            self.writer.write(head.encode() + b"\r\n" + payload)
+            status_line: bytes = await self.reader.readline()
+            if not status_line:
+                raise ConnectionError("connection closed")
+            length: int = 0
+            while True:
+                line: bytes = await self.reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            return int(status_line.split()[1]), await self.reader.readexactly(length)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            self.close()
+            raise
+
+    def close(self) -> None:
+        """Close the connection"""
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+def free_port() -> int:
+    """Port available on the loopback interface"""
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def wait_port(port: int, timeout: float = 30.0) -> None:
+    """Wait for a process to listen on a port"""
+    deadline: float = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((HOST, port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"nothing listening on port {port}")
+
+
+def percentile(latencies: List[float], rank: float) -> float:
+    """Nearest-rank percentile of sorted latencies, in milliseconds"""
+    if not latencies:
+        return 0.0
+    index: int = max(0, math.ceil(rank / 100 * len(latencies)) - 1)
+    return latencies[index] * 1000
+
+
+async def bus_counters(port: int, token: str) -> Dict:
+    """Bus counters of the API"""
+    connection: Connection = Connection(port)
+    try:
+        _, body = await connection.request("GET", "/system/stats", None, token)
+    finally:
+        connection.close()
+    return json.loads(body)["bus"]
+
+
+async def drive(
+    port: int, route: Tuple, tokens: Dict, requests: int
+) -> Tuple[List[float], Dict[str, int], float]:
+    """Send the requests of a route from concurrent connections"""
+    method, path, body, credential = route
+    token: Optional[str] = tokens.get(credential) if credential else None
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    remaining: int = requests
+
+    async def worker() -> None:
+        nonlocal remaining
+        connection: Connection = Connection(port)
+        try:
+            while remaining > 0:
+                remaining -= 1
+                started: float = perf_counter()
+                try:
+                    status_code, _ = await connection.request(method, path, body, token)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    status_code = 0
+                latencies.append(perf_counter() - started)
+                statuses[str(status_code)] = statuses.get(str(status_code), 0) + 1
+        finally:
+            connection.close()
+
+    started: float = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(args.concurrency, requests))))
+    return latencies, statuses, perf_counter() - started
+
+
+async def benchmark(port: int) -> Dict:
+    """Drive every selected route and summarize the measures"""
+    connection: Connection = Connection(port)
+    try:
+        _, body = await connection.request("POST", "/auth/tokens", USER, None)
+    finally:
+        connection.close()
+    tokens: Dict = json.loads(body)
+    results: Dict = {}
+    for route in ROUTES:
+        name: str = f"{route[0]} {route[1]}"
+        if args.routes and not any(
+            pattern in name for pattern in args.routes.split(",")
+        ):
+            continue
+        if args.warmup:
+            await drive(port, route, tokens, args.warmup)
+        before: Dict = await bus_counters(port, tokens["access_token"])
+        latencies, statuses, elapsed = await drive(port, route, tokens, args.requests)
+        after: Dict = await bus_counters(port, tokens["access_token"])
+        latencies.sort()
+        results[name] = {
+            "requests": len(latencies),
+            "errors": sum(
+                count
+                for status_code, count in statuses.items()
+                if not 200 <= int(status_code) < 300
+            ),
+            "statuses": statuses,
+            "rps": round(len(latencies) / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "bus_sent_per_request": round(
+                (after["sent"] - before["sent"]) / len(latencies), 3
+            ),
+            "bus_received_per_request": round(
+                (after["received"] - before["received"]) / len(latencies), 3
+            ),
+            "bus_timeouts": after["timeouts"] - before["timeouts"],
+        }
+        print(
+            f"{name:<48} {results[name]['rps']:>9.1f} "
+            f"{results[name]['p50_ms']:>8.2f} {results[name]['p95_ms']:>8.2f} "
+            f"{results[name]['p99_ms']:>8.2f} "
+            f"{results[name]['bus_sent_per_request']:>6.2f} "
+            f"{results[name]['errors']:>7}"
+        )
+    return results
+
+
+def scenario(name: str, chatter: int, users_db: str) -> Dict:
+    """Run the benchmark against a fresh bus and API"""
+    bus_port: int = free_port()
+    api_port: int = free_port()
+    bus: subprocess.Popen = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "app.testing.fakebus",
+            "--port",
+            str(bus_port),
+            "--latency",
+            str(args.latency),
+            "--chatter",
+            str(chatter),
+            "--api-key",
+            "benchmark",
+        ],
+        cwd=ROOT,
+        stderr=subprocess.PIPE,
+    )
+    env: Dict[str, str] = dict(
+        os.environ,
+        SECRET="benchmark" * 4,
+        API_KEY="benchmark",
+        USERS_DB=users_db,
+        WS_HOST=HOST,
+        WS_PORT=str(bus_port),
+    )
+    env.setdefault("PYTHONWARNINGS", "ignore")
+    if args.no_cache:
+        for ttl in ("CACHE_TTL_INFO", "CACHE_TTL_CONFIG", "CACHE_TTL_SKILL_SETTINGS"):
+            env[ttl] = "0"
+    api: Optional[subprocess.Popen] = None
+    try:
+        wait_port(bus_port)
+        api = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "uvicorn",
+                "app.api:app",
+                "--host",
+                HOST,
+                "--port",
+                str(api_port),
+                "--log-level",
+                "warning",
+                "--no-access-log",
+            ],
+            cwd=ROOT,
+            env=env,
+        )
+        wait_port(api_port)
+        print(f"\n{name}: {chatter} unrelated bus messages per second")
+        print(
+            f"{'route':<48} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+            f"{'p99 ms':>8} {'bus':>6} {'errors':>7}"
+        )
+        routes: Dict = asyncio.run(benchmark(api_port))
+    finally:
+        if api is not None:
+            api.terminate()
+            api.wait()
+        bus.terminate()
+        _, stderr = bus.communicate()
+    try:
+        bus_stats: Dict = json.loads(stderr.decode().strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        bus_stats = {}
+    return {"chatter": chatter, "routes": routes, "bus": bus_stats}
+
+
+def commit() -> Optional[str]:
+    """Commit of the benchmarked tree"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+users = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+json.dump(
+    [
+        {
+            "user": USER["user"],
+            "password": bcrypt.hashpw(
+                USER["password"].encode("utf-8"),
+                bcrypt.gensalt(rounds=args.bcrypt_rounds),
+            ).decode("utf-8"),
+            "active": True,
+        }
+    ],
+    users,
+)
+users.close()
+
+print(
+    f"{args.requests} requests per route, {args.concurrency} connections, "
+    f"{args.latency * 1000:.0f} ms bus latency"
+)
+report: Dict = {
+    "commit": commit(),
+    "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    "options": vars(args),
+    "scenarios": {},
+}
+try:
+    for scenario_name in args.scenarios.split(","):
+        report["scenarios"][scenario_name] = scenario(
+            scenario_name, SCENARIOS[scenario_name], users.name
+        )
+finally:
+    os.unlink(users.name)
+
+if args.output:
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(report, output, indent=2)
+    print(f"\nresults written to {args.output}")
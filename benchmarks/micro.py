@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+"""Measure the hot functions of the request path and detect regressions
+
+Time the JWT functions, the user lookup with a small and a large JSON
+database, the bcrypt verification at several costs, the sanitization and
+the sorted serialization of a large configuration. The fastest of several
+runs is kept, the results can be saved as a baseline and compared to it,
+the script exits with an error when a function got slower than allowed.
+
+    python benchmarks/micro.py --save baseline.json
+    python benchmarks/micro.py --baseline baseline.json --threshold 1.25
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+from timeit import repeat
+from typing import Callable, Dict
+
+import bcrypt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--iterations", type=int, default=2000)
+parser.add_argument("--repeat", type=int, default=5)
+parser.add_argument("--bcrypt-costs", type=str, default="4,8,10,12")
+parser.add_argument("--sections", type=int, default=200)
+parser.add_argument("--save", type=str, default="")
+parser.add_argument("--baseline", type=str, default="")
+parser.add_argument("--threshold", type=float, default=1.25)
+parser.add_argument("--seed", type=int, default=42)
+args = parser.parse_args()
+
+users_db = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+users_db.close()
+
+os.environ.setdefault("SECRET", "benchmark" * 4)
+os.environ.setdefault("API_KEY", "benchmark")
+os.environ["USERS_DB"] = users_db.name
+
+# pylint: disable=wrong-import-position
+from app.auth import bearer, handlers  # noqa: E402
+from app.auth.bearer import JWTBearer  # noqa: E402
+from app.common.responses import response_class  # noqa: E402
+from app.common.utils import sanitize  # noqa: E402
+
+generator = random.Random(args.seed)
+results: Dict[str, float] = {}
+
+
+def write_users(count: int) -> None:
+    """Replace the JSON database, the user store reloads it on the next call"""
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".json", dir=os.path.dirname(users_db.name), delete=False
+    ) as users:
+        json.dump(
+            [
+                {
+                    "user": f"user{index}",
+                    "password": "$2b$12$" + "x" * 53,
+                    "active": True,
+                }
+                for index in range(count)
+            ],
+            users,
+        )
+    os.replace(users.name, users_db.name)
+
+
+def value(depth: int):
+    """Random configuration value, nested like the OVOS plugin sections"""
+    kind: int = generator.randrange(7 if depth < 4 else 4)
+    if kind == 0:
+        return generator.random() < 0.5
+    if kind == 1:
+        return generator.randrange(100_000)
+    if kind == 2:
+        return f"value-{generator.randrange(1_000_000):x}"
+    if kind == 3:
+        return [f"item-{index}" for index in range(generator.randrange(1, 6))]
+    return {
+        f"key_{generator.randrange(1_000_000):x}": value(depth + 1)
+        for _ in range(generator.randrange(2, 10))
+    }
+
+
+def measure(label: str, func: Callable, iterations: int = args.iterations) -> None:
+    """Record and print the fastest average duration in microseconds"""
+    duration: float = min(repeat(func, number=iterations, repeat=args.repeat))
+    results[label] = round(duration / iterations * 1_000_000, 3)
+    print(f"{label:<40} {results[label]:>12.1f} us")
+
+
+print(f"{args.iterations} iterations, best of {args.repeat}")
+
+token: str = handlers.encode_access_jwt("user0")
+measure("encode_access_jwt", lambda: handlers.encode_access_jwt("user0"))
+measure("decode_jwt", lambda: handlers.decode_jwt(token))
+
+for users in (10, 10_000):
+    write_users(users)
+    handlers.get_user("user0")
+    measure(f"get_user ({users} users)", lambda: handlers.get_user(f"user{users - 1}"))
+
+cache_size: int = bearer.token_cache.size
+bearer.token_cache.size = 0
+measure("verify_access_jwt", lambda: JWTBearer.verify_access_jwt(token))
+bearer.token_cache.size = cache_size
+measure("verify_access_jwt (token cache)", lambda: JWTBearer.verify_access_jwt(token))
+
+for cost in (int(cost) for cost in args.bcrypt_costs.split(",")):
+    hashed: str = bcrypt.hashpw(b"benchmark", bcrypt.gensalt(rounds=cost)).decode()
+    measure(
+        f"verify_password (cost {cost})",
+        lambda: handlers.verify_password("benchmark", hashed),
+        max(1, args.iterations >> cost),
+    )
+
+config: dict = {
+    f"section_{generator.randrange(1_000_000):x}": value(1)
+    for _ in range(args.sections)
+}
+config.update({"password": "secret", "key": "secret", "code": 0, "username": "x"})
+measure("sanitize (large config)", lambda: sanitize(dict(config)))
+measure("response (large config)", lambda: response_class(False)(content=config))
+measure("sorted response (large config)", lambda: response_class(True)(content=config))
+
+os.unlink(users_db.name)
+
+if args.save:
+    with open(args.save, "w", encoding="utf-8") as output:
+        json.dump(results, output, indent=2)
+    print(f"\nbaseline written to {args.save}")
+
+if args.baseline:
+    with open(args.baseline, encoding="utf-8") as data:
+        baseline: Dict[str, float] = json.load(data)
+    regressions: int = 0
+    print(f"\ncomparison to {args.baseline}, threshold x{args.threshold}")
+    for label, duration in results.items():
+        if label not in baseline:
+            continue
+        ratio: float = duration / baseline[label]
+        regressed: bool = ratio > args.threshold
+        regressions += regressed
+        print(f"{label:<40} {ratio:>11.2f}x {'REGRESSION' if regressed else ''}")
+    if regressions:
+        sys.exit(f"{regressions} function(s) slower than x{args.threshold}")
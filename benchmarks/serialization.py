@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""Measure the serialization of a configuration response
+
+Compare the encoding of a `mycroft.conf` sized payload by `JSONResponse`,
+with and without the `json.loads(json.dumps(sort_keys=True))` round trip
+the handlers used to sort the keys, with the orjson responses and the
+parsing of the bus message carrying the payload.
+
+    python benchmarks/serialization.py --sections 30 --iterations 500
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+from timeit import timeit
+
+import orjson
+from fastapi.responses import JSONResponse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from app.common.responses import ORJSONResponse, SortedORJSONResponse  # noqa: E402
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--sections", type=int, default=30)
+parser.add_argument("--iterations", type=int, default=500)
+parser.add_argument("--seed", type=int, default=42)
+args = parser.parse_args()
+
+generator = random.Random(args.seed)
+
+
+def value(depth: int):
+    """Random configuration value, nested like the OVOS plugin sections"""
+    kind: int = generator.randrange(8 if depth < 3 else 5)
+    if kind == 0:
+        return generator.random() < 0.5
+    if kind == 1:
+        return generator.randrange(100_000)
+    if kind == 2:
+        return round(generator.random() * 10, 3)
+    if kind == 3:
+        return f"value-{generator.randrange(1_000_000):x}"
+    if kind == 4:
+        return [f"item-{index}" for index in range(generator.randrange(1, 6))]
+    return {
+        f"key_{generator.randrange(1_000_000):x}": value(depth + 1)
+        for _ in range(generator.randrange(2, 10))
+    }
+
+
+def measure(label: str, func) -> None:
+    """Print the average duration of a function in microseconds"""
+    duration: float = timeit(func, number=args.iterations) / args.iterations
+    print(f"{label:<40} {duration * 1_000_000:>10.1f} us")
+
+
+config: dict = {
+    f"section_{generator.randrange(1_000_000):x}": {
+        f"key_{generator.randrange(1_000_000):x}": value(1)
+        for _ in range(generator.randrange(4, 16))
+    }
+    for _ in range(args.sections)
+}
+message: bytes = json.dumps(
+    {"type": "ovos.api.config.answer", "data": config, "context": {}}
+).encode()
+
+print(f"{len(message) // 1024} KiB payload, {args.iterations} iterations")
+measure("bus message (json)", lambda: json.loads(message))
+measure("bus message (orjson)", lambda: orjson.loads(message))
+measure("response (json)", lambda: JSONResponse(content=config))
+measure(
+    "sorted response (json round trip)",
+    lambda: JSONResponse(content=json.loads(json.dumps(config, sort_keys=True))),
+)
+measure("response (orjson)", lambda: ORJSONResponse(content=config))
+measure("sorted response (orjson)", lambda: SortedORJSONResponse(content=config))
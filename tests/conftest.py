@@ -0,0 +1,51 @@
+"""Test configuration, the settings are read when the application is
+imported and must be set first
+"""
+
+import json
+import os
+import socket
+import tempfile
+
+import pytest
+
+
+def free_port() -> int:
+    """Port available on the loopback interface"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+users_db = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+json.dump([{"user": "test", "password": "", "active": True}], users_db)
+users_db.close()
+
+# Second device to check the isolation between devices, its bus is never
+# reached by the tests.
+devices_db = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+json.dump(
+    [{"name": "other", "host": "127.0.0.1", "port": free_port(), "api_key": "test"}],
+    devices_db,
+)
+devices_db.close()
+
+os.environ.update(
+    {
+        "API_KEY": "test",
+        "SECRET": "test" * 8,
+        "USERS_DB": users_db.name,
+        "DEVICES_DB": devices_db.name,
+        "WS_HOST": "127.0.0.1",
+        "WS_PORT": str(free_port()),
+        "WS_RECV_TIMEOUT": "1",
+        "CACHE_TTL_SKILL_SETTINGS": "0",
+        "METRICS_TOKEN": "scrape",
+    }
+)
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    """Run the asynchronous tests with asyncio only"""
+    return "asyncio"
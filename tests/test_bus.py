@@ -0,0 +1,115 @@
+"""Concurrency of the requests waiting for the bus
+"""
+
+import asyncio
+import os
+from time import perf_counter
+
+import httpx
+import pytest
+
+from app.api import app
+from app.auth.handlers import encode_access_jwt
+from app.common.bus import BusClient
+from app.common.deadline import budget
+from app.common.devices import devices
+from app.config import get_settings
+from app.testing.fakebus import FakeBus
+
+settings = get_settings()
+
+REQUESTS: int = 8
+
+
+@pytest.mark.anyio
+async def test_slow_requests_wait_concurrently():
+    """N requests answered after almost a timeout finish in about one
+    timeout, not N of them
+    """
+    bus: FakeBus = FakeBus(
+        latency=settings.ws_recv_timeout * 0.8, api_key=os.environ["API_KEY"]
+    )
+    server: asyncio.Task = asyncio.create_task(
+        bus.serve("127.0.0.1", int(os.environ["WS_PORT"]))
+    )
+    await asyncio.sleep(0.2)
+    headers = {"Authorization": f"Bearer {encode_access_jwt('test')}"}
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            # Fills the skill registry and the requirements status, each
+            # request below then waits for a single bus answer.
+            warmup = await client.get(
+                "/v1/skills/skill-fake-9.openvoiceos/settings", headers=headers
+            )
+            assert warmup.status_code == 200
+            received: int = bus.received
+
+            started: float = perf_counter()
+            responses = await asyncio.gather(
+                *[
+                    client.get(
+                        f"/v1/skills/skill-fake-{index}.openvoiceos/settings",
+                        headers=headers,
+                    )
+                    for index in range(REQUESTS)
+                ]
+            )
+            elapsed: float = perf_counter() - started
+    finally:
+        await devices["default"].bus.close()
+        server.cancel()
+
+    assert [response.status_code for response in responses] == [200] * REQUESTS
+    assert bus.received - received == REQUESTS
+    assert bus.latency <= elapsed < 2 * settings.ws_recv_timeout
+
+
+@pytest.mark.anyio
+async def test_identical_read_only_requests_share_one_round_trip():
+    """Identical read-only requests send a single message, a caller with a
+    shorter deadline leaves without cancelling the shared round trip
+    """
+    bus: FakeBus = FakeBus(latency=0.3, api_key=os.environ["API_KEY"])
+    server: asyncio.Task = asyncio.create_task(
+        bus.serve("127.0.0.1", int(os.environ["WS_PORT"]))
+    )
+    await asyncio.sleep(0.2)
+    client: BusClient = BusClient(uri=settings.ws_uri, timeout=settings.ws_conn_timeout)
+    payload = {"type": "ovos.api.info", "data": {"app_key": settings.app_key}}
+
+    async def short() -> dict:
+        with budget(0.1):
+            return await client.request(
+                payload, "ovos.api.info.answer", settings.ws_recv_timeout
+            )
+
+    try:
+        await client.connect()
+        received: int = bus.received
+        leader: asyncio.Task = asyncio.create_task(
+            client.request(payload, "ovos.api.info.answer", settings.ws_recv_timeout)
+        )
+        await asyncio.sleep(0)
+        answers = await asyncio.gather(
+            short(),
+            *[
+                client.request(
+                    payload, "ovos.api.info.answer", settings.ws_recv_timeout
+                )
+                for _ in range(REQUESTS - 2)
+            ],
+        )
+        answers.append(await leader)
+    finally:
+        await client.close()
+        server.cancel()
+
+    assert bus.received - received == 1
+    assert client.leaders == 1
+    assert client.coalesced == REQUESTS - 1
+    assert client.timeouts == 1
+    assert answers[0] == {}
+    assert all(answer["type"] == "ovos.api.info.answer" for answer in answers[1:])
+    assert len(answers) == REQUESTS
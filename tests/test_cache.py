@@ -0,0 +1,61 @@
+"""Cached responses of the read-only routes
+"""
+
+import asyncio
+import os
+
+import httpx
+import pytest
+
+from app.api import app
+from app.auth.handlers import encode_access_jwt
+from app.common.devices import devices
+from app.testing.fakebus import FakeBus
+
+
+@pytest.mark.anyio
+async def test_info_revalidation_and_invalidation():
+    """A matching ETag gets a 304 without bus round trip and a configuration
+    event sends the next request to the bus again
+    """
+    bus: FakeBus = FakeBus(api_key=os.environ["API_KEY"])
+    server: asyncio.Task = asyncio.create_task(
+        bus.serve("127.0.0.1", int(os.environ["WS_PORT"]))
+    )
+    await asyncio.sleep(0.2)
+    device = devices["default"]
+    device.responses.invalidate("system.info")
+    headers = {"Authorization": f"Bearer {encode_access_jwt('test')}"}
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            first = await client.get("/v1/system/info", headers=headers)
+            etag: str = first.headers["etag"]
+            received: int = bus.received
+
+            revalidated = await client.get(
+                "/v1/system/info", headers={**headers, "If-None-Match": etag}
+            )
+            assert bus.received == received
+
+            invalidations: int = device.responses.invalidations
+            await device.bus.send({"type": "configuration.updated", "data": {}})
+            for _ in range(50):
+                if device.responses.invalidations > invalidations:
+                    break
+                await asyncio.sleep(0.01)
+            received = bus.received
+            refetched = await client.get(
+                "/v1/system/info", headers={**headers, "If-None-Match": etag}
+            )
+    finally:
+        await device.bus.close()
+        server.cancel()
+
+    assert first.status_code == 200
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+    assert bus.received - received == 1
+    # The information did not change, the fresh response has the same ETag
+    assert refetched.status_code == 304
@@ -0,0 +1,68 @@
+"""Order of the commands sent to the bus
+"""
+
+import asyncio
+from typing import List
+
+import pytest
+from fastapi import HTTPException
+
+from app.common.commands import CommandQueue
+from app.common.typing import JSONStructure
+
+
+class RecordingBus:
+    """Bus connection recording the message types, the first message is
+    slow to send so the next ones wait in the queue
+    """
+
+    def __init__(self):
+        self.sent: List[str] = []
+
+    async def send(self, payload: JSONStructure) -> None:
+        if not self.sent:
+            await asyncio.sleep(0.05)
+        self.sent.append(payload["type"])
+
+
+@pytest.mark.anyio
+async def test_commands_sent_in_queue_order():
+    """Control messages keep their place, a stop follows the speech queued
+    before it and mute and unmute never pass each other
+    """
+    bus: RecordingBus = RecordingBus()
+    commands: CommandQueue = CommandQueue(bus, size=8, reserved=2)
+    types: List[str] = [
+        "speak",
+        "speak",
+        "mycroft.stop",
+        "mycroft.mic.unmute",
+        "mycroft.mic.mute",
+    ]
+    try:
+        for message_type in types:
+            commands.submit({"type": message_type, "data": {}})
+        for _ in range(20):
+            if len(bus.sent) == len(types):
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await commands.close()
+
+    assert bus.sent == types
+
+
+@pytest.mark.anyio
+async def test_reserved_places_accept_control_messages():
+    """A queue full of regular messages still accepts a stop"""
+    commands: CommandQueue = CommandQueue(RecordingBus(), size=3, reserved=1)
+    try:
+        commands.submit({"type": "speak", "data": {}})
+        commands.submit({"type": "speak", "data": {}})
+        with pytest.raises(HTTPException):
+            commands.submit({"type": "speak", "data": {}})
+        commands.submit({"type": "mycroft.stop", "data": {}})
+    finally:
+        await commands.close()
+
+    assert commands.rejected == 1
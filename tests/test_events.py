@@ -0,0 +1,36 @@
+"""Capacity of the bus event streaming
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.common import events
+from app.common.devices import devices
+from app.handlers import bus
+
+
+@pytest.mark.anyio
+async def test_concurrent_clients_never_exceed_capacity(monkeypatch):
+    """Concurrent clients are subscribed or rejected in the same step"""
+    device_hub: events.EventHub = events.EventHub(
+        devices["default"].bus, queue_size=4, max_clients=2
+    )
+    monkeypatch.setitem(events.hubs, "default", device_hub)
+    results = await asyncio.gather(
+        *[bus.events("speak") for _ in range(5)], return_exceptions=True
+    )
+    streams = [result for result in results if not isinstance(result, Exception)]
+    rejections = [result for result in results if isinstance(result, HTTPException)]
+    try:
+        assert len(streams) == 2
+        assert len(rejections) == 3
+        assert device_hub.stats()["clients"] == 2
+        assert device_hub.rejected == 3
+    finally:
+        for stream in streams:
+            assert await stream.__anext__() == ": connected\n\n"
+            await stream.aclose()
+    await asyncio.sleep(0)
+    assert device_hub.stats()["clients"] == 0
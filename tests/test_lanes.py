@@ -0,0 +1,42 @@
+"""Execution slots of the HTTP requests
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.api import app
+from app.auth.handlers import encode_access_jwt
+from app.common import lanes
+from app.common.lanes import RouteLanes
+
+
+@pytest.mark.anyio
+async def test_lanes_per_device_and_control_routes(monkeypatch):
+    """A device without free slot still answers its control routes, with
+    or without the device prefix, and does not delay another device
+    """
+    busy: RouteLanes = RouteLanes(1)
+    monkeypatch.setitem(lanes.lanes, "default", busy)
+    assert await busy.acquire()
+    headers = {"Authorization": f"Bearer {encode_access_jwt('test')}"}
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            responses = await asyncio.wait_for(
+                asyncio.gather(
+                    client.delete("/v1/voice/speech", headers=headers),
+                    client.delete("/v1/devices/default/voice/speech", headers=headers),
+                    client.get("/v1/devices/other/system/stats", headers=headers),
+                ),
+                timeout=2,
+            )
+    finally:
+        busy.release()
+
+    assert [response.status_code for response in responses] == [202, 202, 200]
+    assert busy.control == 2
+    assert busy.running == 0
+    assert responses[2].json()["lanes"]["running"] == 1
@@ -0,0 +1,34 @@
+"""Authentication of the Prometheus metrics
+"""
+
+import httpx
+import pytest
+
+from app.api import app
+from app.auth.handlers import encode_access_jwt, encode_refresh_jwt
+
+
+@pytest.mark.anyio
+async def test_metrics_accept_static_and_access_tokens():
+    """The scrapers use the static token, the users their access token"""
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        anonymous = await client.get("/metrics")
+        refresh = await client.get(
+            "/metrics",
+            headers={"Authorization": f"Bearer {encode_refresh_jwt('test')}"},
+        )
+        scraper = await client.get(
+            "/metrics", headers={"Authorization": "Bearer scrape"}
+        )
+        user = await client.get(
+            "/metrics",
+            headers={"Authorization": f"Bearer {encode_access_jwt('test')}"},
+        )
+
+    assert anonymous.status_code == 403
+    assert refresh.status_code == 401
+    assert scraper.status_code == 200
+    assert user.status_code == 200
+    assert "ovos_api_http_request_duration_seconds" in scraper.text